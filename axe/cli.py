@@ -1,12 +1,25 @@
 import argparse
 import logging
-from .tree import tree
-from .route_evaluator import evaluate
-from .config_manager import render
 
-# Set up basic logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+
+# Subcommand modules are imported on dispatch so that `axe --help` does not
+# pay for importing yaml, rich and the evaluator.
+def _tree(args: argparse.Namespace) -> int:
+    from .tree import tree
+
+    return tree(args)
+
+
+def _evaluate(args: argparse.Namespace) -> int:
+    from .route_evaluator import evaluate
+
+    return evaluate(args)
+
+
+def _render(args: argparse.Namespace) -> int:
+    from .config_manager import render
+
+    return render(args)
 
 
 def main():
@@ -21,7 +34,17 @@ def main():
         "tree", help="Displays alertmanager configuration route tree"
     )
     tree_parser.add_argument("file_path", help="Path to the YAML file")
-    tree_parser.set_defaults(func=tree)
+    tree_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache the parsed configuration in <file_path>.pkl",
+    )
+    tree_parser.add_argument(
+        "--plain",
+        action="store_true",
+        help="Print the tree as plain indented text without colors",
+    )
+    tree_parser.set_defaults(func=_tree)
 
     # Evaluate command
     evaluate_parser = subparsers.add_parser(
@@ -29,10 +52,15 @@ def main():
     )
     evaluate_parser.add_argument("file_path", help="Path to the YAML file")
     evaluate_parser.add_argument("--alert", help="Alert to evaluate")
+    evaluate_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache the parsed configuration in <file_path>.pkl",
+    )
     evaluate_parser.add_argument(
         "--verbose", action="store_true", help="Enable verbose output"
     )
-    evaluate_parser.set_defaults(func=evaluate)
+    evaluate_parser.set_defaults(func=_evaluate)
 
     # Config command
     config_parser = subparsers.add_parser(
@@ -42,10 +70,12 @@ def main():
     config_parser.add_argument(
         "--verbose", action="store_true", help="Enable verbose output"
     )
-    config_parser.set_defaults(func=render)
+    config_parser.set_defaults(func=_render)
 
     args = parser.parse_args()
     if hasattr(args, "func"):
+        # Set up basic logging only when a subcommand actually runs
+        logging.basicConfig(level=logging.INFO)
         args.func(args)
     else:
         parser.print_help()
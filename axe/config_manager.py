@@ -1,12 +1,77 @@
 #!/usr/bin/env python3
-import copy
 import yaml
 import os
+import re
+import sys
 import logging
 
-from typing import List, Dict, Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Iterator, List, Dict, Any, Tuple, Union
 from argparse import Namespace
 
+# Prefer the libyaml-backed loader/dumper, falling back to the pure-Python
+# implementations when PyYAML was built without libyaml.
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+_YAML_SUFFIXES = (".yaml", ".yml")
+
+# Top-level keys of a routing fragment, in the order they are processed so
+# that receivers are known before routes referencing them are validated.
+_COMPONENTS = ("receivers", "routes", "time_intervals")
+
+# A whole string value of the form '$VAR', substituted from the environment.
+_ENV_VAR_RE = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)")
+
+# Matches a 'receivers', 'routes' or 'time_intervals' mapping key, used to skip
+# parsing YAML files that cannot contain routing components. Files saved with
+# a UTF-8 byte order mark have it in front of their first key.
+_COMPONENT_KEY_RE = re.compile(
+    rb"""(?:^|[{,]|\A\xef\xbb\xbf)[ \t]*["']?(?:receivers|routes|time_intervals)["']?[ \t]*:""",
+    re.M,
+)
+
+# Receiver integration configs to validate, as (config key, label used in
+# messages, fields that must be present and non-empty in every entry).
+# Add entries here for other receiver types (email, slack etc.).
+_RECEIVER_CONFIG_RULES = (("webhook_configs", "Webhook", ("url",)),)
+
+# Fragments up to this many bytes are always parsed, so small files that are
+# not routing fragments still go through validation. Larger files are only
+# parsed when a routing component key appears in them.
+_ALWAYS_PARSE_SIZE = 2048
+
+# A '---' document separator after the start of a file.
+_DOCUMENT_START_RE = re.compile(rb"^---(?:[ \t]|$)", re.M)
+
+
+def _merge_fragment_documents(documents: List[Any]) -> Any:
+    """
+    Merges the documents of a multi-document routing fragment into a single
+    mapping by concatenating their component lists. A single document is
+    returned as is, and a list of documents is returned unmerged if any of
+    them is not a mapping so the caller can report it.
+    """
+    if len(documents) == 1:
+        return documents[0]
+    if not all(isinstance(doc, dict) for doc in documents):
+        return documents
+
+    merged: Dict[str, Any] = {}
+    for doc in documents:
+        for key, value in doc.items():
+            if key not in _COMPONENTS:
+                merged.setdefault(key, value)
+            elif isinstance(value, dict) and key == "routes":
+                merged.setdefault(key, []).append(value)
+            elif isinstance(value, list) and isinstance(merged.get(key, []), list):
+                merged[key] = merged.get(key, []) + value
+            else:
+                # Keep the invalid value so it is reported during loading
+                merged[key] = value
+    return merged
+
 
 class UniqueList:
     def __init__(self, initial_list: list = None, key_attribute: str = "name"):
@@ -18,8 +83,8 @@ class UniqueList:
             key_attribute: The name of the attribute (string key for dictionaries)
                            that should be unique.
         """
-        self.items_list = []
-        self.unique_keys = set()
+        # Insertion-ordered mapping of key value -> item
+        self.items_by_key: Dict[str, Dict[str, Any]] = {}
         self.key_attribute = key_attribute
 
         if initial_list:
@@ -47,28 +112,24 @@ class UniqueList:
                 f"Error: '{self.key_attribute}' value '{key_value}' is invalid or empty."
             )
 
-        if key_value in self.unique_keys:
+        if key_value in self.items_by_key:
             raise ValueError(
                 f"Error: An item with '{self.key_attribute}' '{key_value}' already exists."
             )
 
-        self.items_list.append(item)
-        self.unique_keys.add(key_value)
-        logging.debug(f"Added item with {self.key_attribute}: {key_value}")
+        self.items_by_key[key_value] = item
+        logging.debug("Added item with %s: %s", self.key_attribute, key_value)
 
     def get_all_items(self) -> List[Dict[str, Any]]:
-        return self.items_list
+        return list(self.items_by_key.values())
 
     def has_key(self, key_value: str) -> bool:
         """Checks if a key value already exists in the manager."""
-        return key_value in self.unique_keys
+        return key_value in self.items_by_key
 
     def get_item_by_key(self, key_value: str) -> Union[Dict[str, Any], None]:
         """Retrieves an item by its key value."""
-        for item in self.items_list:
-            if item.get(self.key_attribute) == key_value:
-                return item
-        return None
+        return self.items_by_key.get(key_value)
 
 
 class ConfigManager:
@@ -84,7 +145,24 @@ class ConfigManager:
         # New: Stores all defined receivers from all files, including their source.
         # Format: {"receiver_name": {"data": {...}, "source_file": "path/to/file.yaml"}}
         self.all_defined_receivers: Dict[str, Dict[str, Any]] = {}
-        self.validation_issues: List[str] = []  # Collect all validation issues
+        # Validation issues are logged as they are found; only counts are kept.
+        self.fatal_count: int = 0
+        self.warning_count: int = 0
+        # Parsed YAML keyed by (absolute path, mtime_ns, size) so repeat loads of
+        # an unchanged file skip parsing.
+        self._yaml_cache: Dict[Tuple[str, int, int], Any] = {}
+
+    def _issue(self, message: str, *args: Any, fatal: bool = True):
+        """
+        Logs a validation issue and counts it. Fatal issues abort rendering
+        once all inputs have been processed; others are reported as warnings.
+        `message` is a %-style template formatted lazily by logging with `args`.
+        """
+        logging.error(message, *args)
+        if fatal:
+            self.fatal_count += 1
+        else:
+            self.warning_count += 1
 
     def _add_receiver_to_master_list(
         self, receiver_data: Dict[str, Any], source_file: str
@@ -94,22 +172,29 @@ class ConfigManager:
         """
         receiver_name = receiver_data.get("name")
         if not receiver_name:
-            self.validation_issues.append(
-                f"Error: Receiver definition in '{source_file}' is missing the 'name' key."
+            self._issue(
+                "Error: Receiver definition in '%s' is missing the 'name' key.",
+                source_file,
             )
             return
 
         if not isinstance(receiver_name, str) or not receiver_name:
-            self.validation_issues.append(
-                f"Error: Receiver name '{receiver_name}' in '{source_file}' is invalid or empty."
+            self._issue(
+                "Error: Receiver name '%s' in '%s' is invalid or empty.",
+                receiver_name,
+                source_file,
             )
             return
 
+        # Interned so route reference lookups compare keys by identity
+        receiver_name = sys.intern(receiver_name)
         if receiver_name in self.all_defined_receivers:
             existing_source = self.all_defined_receivers[receiver_name]["source_file"]
-            self.validation_issues.append(
-                f"Error: Duplicate receiver name '{receiver_name}' found. "
-                f"First defined in '{existing_source}', duplicated in '{source_file}'."
+            self._issue(
+                "Error: Duplicate receiver name '%s' found. First defined in '%s', duplicated in '%s'.",
+                receiver_name,
+                existing_source,
+                source_file,
             )
         else:
             self.all_defined_receivers[receiver_name] = {
@@ -117,7 +202,9 @@ class ConfigManager:
                 "source_file": source_file,
             }
             logging.debug(
-                f"Added receiver '{receiver_name}' from '{source_file}' to master list."
+                "Added receiver '%s' from '%s' to master list.",
+                receiver_name,
+                source_file,
             )
             # Perform immediate validation for receiver config itself (e.g., webhook URL)
             self._validate_single_receiver_config(receiver_data, source_file)
@@ -132,67 +219,129 @@ class ConfigManager:
             "name", "N/A"
         )  # Use N/A if name is missing earlier
 
-        if "webhook_configs" in receiver_data:
-            if not isinstance(receiver_data["webhook_configs"], list):
-                self.validation_issues.append(
-                    f"Error: 'webhook_configs' for receiver '{receiver_name}' in file '{source_file}' must be a list."
+        for config_key, label, required_fields in _RECEIVER_CONFIG_RULES:
+            if config_key not in receiver_data:
+                continue
+            configs = receiver_data[config_key]
+            if not isinstance(configs, list):
+                self._issue(
+                    "Error: '%s' for receiver '%s' in file '%s' must be a list.",
+                    config_key,
+                    receiver_name,
+                    source_file,
                 )
-            else:
-                for i, webhook_config in enumerate(receiver_data["webhook_configs"]):
-                    if not isinstance(webhook_config, dict):
-                        self.validation_issues.append(
-                            f"Error: Webhook config {i} for receiver '{receiver_name}' in file '{source_file}' is not a dictionary."
-                        )
-                        continue
-                    if "url" not in webhook_config or not webhook_config["url"]:
-                        self.validation_issues.append(
-                            f"Error: Webhook config {i} for receiver '{receiver_name}' in file '{source_file}' is missing a 'url' or it's empty in '{source_file}'."
+                continue
+            for i, config in enumerate(configs):
+                if not isinstance(config, dict):
+                    self._issue(
+                        "Error: %s config %s for receiver '%s' in file '%s' is not a dictionary.",
+                        label,
+                        i,
+                        receiver_name,
+                        source_file,
+                    )
+                    continue
+                for field in required_fields:
+                    if not config.get(field):
+                        self._issue(
+                            "Error: %s config %s for receiver '%s' in file '%s' is missing a '%s' or it's empty in '%s'.",
+                            label,
+                            i,
+                            receiver_name,
+                            source_file,
+                            field,
+                            source_file,
                         )
-        # Add more specific validations here for other receiver types (email, slack etc.)
-        # Example:
-        # if 'email_configs' in receiver_data:
-        #     if not isinstance(receiver_data['email_configs'], list):
-        #         self.validation_issues.append(f"Error: 'email_configs' for receiver '{receiver_name}' in file '{source_file}' must be a list.")
-        #     else:
-        #         for i, email_config in enumerate(receiver_data['email_configs']):
-        #             if 'to' not in email_config or not email_config['to']:
-        #                 self.validation_issues.append(f"Error: Email config {i} for receiver '{receiver_name}' missing 'to' address in '{source_file}'.")
 
     def _validate_route_receiver_reference(
         self, route_node: Dict[str, Any], path: str, source_file: str
     ):
         """
-        Validates that a receiver referenced in a route exists in the master list.
+        Validates that receivers referenced in a route and all of its sub-routes
+        exist in the master list.
         """
-        if "receiver" in route_node:
-            receiver_name = route_node["receiver"]
-            if not isinstance(receiver_name, str) or not receiver_name:
-                self.validation_issues.append(
-                    f"Error: Invalid or empty receiver name at '{path}.receiver' in file '{source_file}'."
+        # Walk the route tree with an explicit stack, visiting nodes in the
+        # same depth-first order as a recursive walk.
+        todo = [(route_node, path)]
+        while todo:
+            node, node_path = todo.pop()
+            if node is not route_node and not isinstance(node, dict):
+                self._issue(
+                    "Error: Sub-route at '%s' in file '%s' is not a dictionary.",
+                    node_path,
+                    source_file,
                 )
-                return
-
-            if receiver_name not in self.all_defined_receivers:
-                self.validation_issues.append(
-                    f"Error: Receiver '{receiver_name}' referenced at '{path}' "
-                    f"in file '{source_file}' is not defined in any 'receivers' section."
-                )
-
-        if "routes" in route_node:
-            if not isinstance(route_node["routes"], list):
-                self.validation_issues.append(
-                    f"Error: 'routes' at '{path}.routes' in file '{source_file}' must be a list."
-                )
-                return
-            for i, sub_route in enumerate(route_node["routes"]):
-                if not isinstance(sub_route, dict):
-                    self.validation_issues.append(
-                        f"Error: Sub-route at '{path}.routes[{i}]' in file '{source_file}' is not a dictionary."
+                continue
+
+            if "receiver" in node:
+                receiver_name = node["receiver"]
+                if not isinstance(receiver_name, str) or not receiver_name:
+                    self._issue(
+                        "Error: Invalid or empty receiver name at '%s.receiver' in file '%s'.",
+                        node_path,
+                        source_file,
                     )
                     continue
-                self._validate_route_receiver_reference(
-                    sub_route, f"{path}.routes[{i}]", source_file
+
+                receiver_name = sys.intern(receiver_name)
+                if receiver_name not in self.all_defined_receivers:
+                    self._issue(
+                        "Error: Receiver '%s' referenced at '%s' in file '%s' is not defined in any 'receivers' section.",
+                        receiver_name,
+                        node_path,
+                        source_file,
+                    )
+
+            if "routes" not in node:
+                continue
+            if not isinstance(node["routes"], list):
+                self._issue(
+                    "Error: 'routes' at '%s.routes' in file '%s' must be a list.",
+                    node_path,
+                    source_file,
                 )
+                continue
+
+            todo.extend(
+                (sub_route, f"{node_path}.routes[{i}]")
+                for i, sub_route in reversed(list(enumerate(node["routes"])))
+            )
+
+    def _load_yaml(self, file_path: str, routing_only: bool = False) -> Any:
+        """
+        Parses a YAML file, serving unchanged files from the parse cache.
+        Safe to call from worker threads; errors are raised to the caller.
+
+        With `routing_only`, files larger than _ALWAYS_PARSE_SIZE that never
+        mention a routing component key are not parsed and an empty dictionary
+        is returned instead, and files holding several '---' separated
+        documents are merged into one.
+        """
+        st = os.stat(file_path)
+        cache_key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+        if cache_key in self._yaml_cache:
+            logging.debug("Using cached YAML for %s", file_path)
+            return self._yaml_cache[cache_key]
+
+        # Read the whole file up front so libyaml scans a single buffer
+        # instead of pulling chunks through the Python I/O stack.
+        with open(file_path, "rb") as file:
+            data = file.read()
+        if (
+            routing_only
+            and len(data) > _ALWAYS_PARSE_SIZE
+            and not _COMPONENT_KEY_RE.search(data)
+        ):
+            logging.debug("No routing keys in %s, skipping parse", file_path)
+            return {}
+        if routing_only and _DOCUMENT_START_RE.search(data, 1):
+            content = _merge_fragment_documents(
+                [doc for doc in yaml.load_all(data, Loader=Loader) if doc is not None]
+            )
+        else:
+            content = yaml.load(data, Loader=Loader)
+        self._yaml_cache[cache_key] = content
+        return content
 
     def read_yaml_file(self, file_path: str) -> Union[Dict[str, Any], List[Any], None]:
         """
@@ -204,29 +353,63 @@ class ConfigManager:
         Returns:
             Union[Dict[str, Any], List[Any], None]: The loaded YAML content,
                                                     or None if an error occurs.
+                                                    The content may be shared
+                                                    with the parse cache and
+                                                    must not be mutated.
+        """
+        logging.debug("Attempting to read YAML file: %s", file_path)
+        return self._finish_yaml_read(file_path, partial(self._load_yaml, file_path))
+
+    def _finish_yaml_read(
+        self, file_path: str, load: Callable[[], Any]
+    ) -> Union[Dict[str, Any], List[Any], None]:
+        """
+        Runs `load` for `file_path`, substituting environment variables in the
+        result and recording any error as a validation issue.
         """
-        logging.debug(f"Attempting to read YAML file: {file_path}")
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                content = yaml.safe_load(file)
-                logging.debug(f"Successfully loaded YAML from {file_path}")
-                return self.replace_env_vars(content)
+            content = load()
+            logging.debug("Successfully loaded YAML from %s", file_path)
+            return self.replace_env_vars(content)
         except FileNotFoundError:
-            logging.error(f"File not found: {file_path}")
+            logging.error("File not found: %s", file_path)
             return None
         except yaml.YAMLError as e:
-            logging.error(f"Error parsing YAML file {file_path}: {e}")
-            self.validation_issues.append(f"Error parsing YAML file {file_path}: {e}")
+            self._issue("Error parsing YAML file %s: %s", file_path, e, fatal=False)
             return None
         except Exception as e:
-            logging.error(
-                f"An unexpected error occurred while reading {file_path}: {e}"
-            )
-            self.validation_issues.append(
-                f"An unexpected error occurred while reading {file_path}: {e}"
+            self._issue(
+                "An unexpected error occurred while reading %s: %s",
+                file_path,
+                e,
+                fatal=False,
             )
             return None
 
+    def _iter_yaml_files(self, folder: str) -> Iterator[os.DirEntry]:
+        """
+        Yields candidate fragment files under `folder`. Like os.walk, files in a
+        directory are yielded before descending into its sub-directories and
+        symlinked directories are not followed.
+        """
+        try:
+            with os.scandir(folder) as it:
+                entries = list(it)
+        except OSError as e:
+            logging.warning("Unable to list directory %s: %s", folder, e)
+            return
+
+        sub_dirs = []
+        for entry in entries:
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    sub_dirs.append(entry.path)
+            elif entry.name.endswith(_YAML_SUFFIXES) and entry.name != self.base_file:
+                yield entry
+
+        for sub_dir in sub_dirs:
+            yield from self._iter_yaml_files(sub_dir)
+
     def find_and_load_routing_configs(self, base_folder: str) -> Dict[str, Any]:
         """
         Recursively searches for and loads YAML files containing routing components.
@@ -239,98 +422,111 @@ class ConfigManager:
             Dict[str, Any]: A dictionary containing lists of loaded receivers, routes, and time_intervals.
         """
         logging.info(
-            f"Searching for routes and receivers config in '{base_folder}' directory"
+            "Searching for routes and receivers config in '%s' directory", base_folder
         )
 
-        routing_config = {"receivers": [], "routes": [], "time_intervals": []}
+        routing_config = {name: [] for name in _COMPONENTS}
 
         processed_files = set()
+        file_paths = []
 
-        for root, _, files in os.walk(base_folder):
-            for file_name in files:
-                if (
-                    file_name
-                    and file_name.endswith((".yaml", ".yml"))
-                    and file_name != self.base_file
-                ):
-                    file_path = os.path.join(root, file_name)
-                    abs_file_path = os.path.abspath(file_path)
+        for entry in self._iter_yaml_files(base_folder):
+            abs_file_path = os.path.abspath(entry.path)
 
-                    if abs_file_path in processed_files:
-                        logging.debug(f"Skipping already processed file: {file_path}")
-                        continue
+            if abs_file_path in processed_files:
+                logging.debug("Skipping already processed file: %s", entry.path)
+                continue
 
-                    processed_files.add(abs_file_path)
+            processed_files.add(abs_file_path)
+            file_paths.append(entry.path)
 
-                    logging.info(f"Processing configuration file: {file_path}")
-                    config = self.read_yaml_file(file_path)
+        # Files are read and parsed concurrently; validation and merging below
+        # stay sequential and in walk order.
+        max_workers = min(32, (os.cpu_count() or 1) * 4, max(len(file_paths), 1))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._load_yaml, path, True) for path in file_paths
+            ]
 
-                    if config is None:
-                        logging.warning(
-                            f"Skipping file {file_path} due to previous error."
-                        )
-                        continue
+            for file_path, future in zip(file_paths, futures):
+                logging.info("Processing configuration file: %s", file_path)
+                config = self._finish_yaml_read(file_path, future.result)
 
-                    if not isinstance(config, dict):
-                        self.validation_issues.append(
-                            f"Error: Skipping {file_path}: Expected a dictionary at root, but got {type(config).__name__}. File content: {config}"
-                        )
-                        continue
-
-                    found_expected_component = False
-                    for component_name in ["receivers", "routes", "time_intervals"]:
-                        if component_name in config:
-                            found_expected_component = True
-                            component_data = config.get(component_name)
-
-                            if not isinstance(component_data, list):
-                                if component_name == "routes" and isinstance(
-                                    component_data, dict
-                                ):
-                                    # For a single route dictionary, wrap it in a list
-                                    routing_config[component_name].append(
-                                        component_data
-                                    )
-                                    logging.info(
-                                        f"Found a single route dictionary in {file_path}, adding..."
-                                    )
-                                    # Validate this single route's receiver reference
-                                    self._validate_route_receiver_reference(
-                                        component_data, "route", file_path
-                                    )
-                                else:
-                                    self.validation_issues.append(
-                                        f"Error: Expected a list for '{component_name}' in {file_path}, but got {type(component_data).__name__}. "
-                                    )
-                                    break  # Critical error for this file, stop processing its components
-
-                            if component_name == "receivers":
-                                for receiver in component_data:
-                                    self._add_receiver_to_master_list(
-                                        receiver, file_path
-                                    )
-                                logging.info(
-                                    f"Found {len(component_data)} receivers in {file_path}, adding and validating..."
-                                )
-                            elif component_name == "routes":
-                                for i, route_node in enumerate(component_data):
-                                    self._validate_route_receiver_reference(
-                                        route_node, f"routes[{i}]", file_path
-                                    )
-                                logging.info(
-                                    f"Found {len(component_data)} routes in {file_path}, validating references..."
-                                )
+                if config is None:
+                    logging.warning(
+                        "Skipping file %s due to previous error.", file_path
+                    )
+                    continue
+
+                if not isinstance(config, dict):
+                    self._issue(
+                        "Error: Skipping %s: Expected a dictionary at root, but got %s. File content: %s",
+                        file_path,
+                        type(config).__name__,
+                        config,
+                    )
+                    continue
+
+                present_components = [name for name in _COMPONENTS if name in config]
+                if not present_components:
+                    logging.warning(
+                        "Skipping %s: No expected root keys ('receivers', 'routes', 'time_intervals') found.",
+                        file_path,
+                    )
+                    continue
+
+                for component_name in present_components:
+                    component_data = config[component_name]
 
+                    if not isinstance(component_data, list):
+                        if component_name == "routes" and isinstance(
+                            component_data, dict
+                        ):
+                            # For a single route dictionary, wrap it in a list
+                            routing_config[component_name].append(component_data)
                             logging.info(
-                                f"Found {len(component_data)} valid {component_name}, adding..."
+                                "Found a single route dictionary in %s, adding...",
+                                file_path,
                             )
-                            routing_config[component_name].extend(component_data)
-
-                    if not found_expected_component:
-                        logging.warning(
-                            f"Skipping {file_path}: No expected root keys ('receivers', 'routes', 'time_intervals') found."
+                            # Validate this single route's receiver reference
+                            self._validate_route_receiver_reference(
+                                component_data, "route", file_path
+                            )
+                        else:
+                            self._issue(
+                                "Error: Expected a list for '%s' in %s, but got %s. ",
+                                component_name,
+                                file_path,
+                                type(component_data).__name__,
+                            )
+                            break  # Critical error for this file, stop processing its components
+
+                    if component_name == "receivers":
+                        for receiver in component_data:
+                            self._add_receiver_to_master_list(receiver, file_path)
+                        logging.info(
+                            "Found %s receivers in %s, adding and validating...",
+                            len(component_data),
+                            file_path,
+                        )
+                    elif component_name == "routes":
+                        for i, route_node in enumerate(component_data):
+                            self._validate_route_receiver_reference(
+                                route_node, f"routes[{i}]", file_path
+                            )
+                        logging.info(
+                            "Found %s routes in %s, validating references...",
+                            len(component_data),
+                            file_path,
                         )
 
+                    logging.info(
+                        "Found %s valid %s, adding...",
+                        len(component_data),
+                        component_name,
+                    )
+                    routing_config[component_name].extend(component_data)
+
         return routing_config
 
     def write_yaml_file(self, data: Dict[str, Any], file_path: str) -> int:
@@ -344,43 +540,81 @@ class ConfigManager:
         Returns:
             int: 0 on success, 1 on failure.
         """
-        logging.info(f"Attempting to write combined configuration to: {file_path}")
+        logging.info("Attempting to write combined configuration to: %s", file_path)
         try:
             with open(file_path, "w", encoding="utf-8") as file:
                 yaml.dump(
                     data=data,
                     stream=file,
+                    Dumper=Dumper,
                     indent=2,
                     default_flow_style=False,
                     sort_keys=False,  # Preserve order if needed, or set to True for consistent output
+                    width=1_000_000,  # Don't wrap long strings such as templates and URLs
+                    allow_unicode=True,
                 )
-            logging.info(f"Successfully generated {file_path}")
+            logging.info("Successfully generated %s", file_path)
             return 0
         except IOError as e:
-            logging.critical(f"Error writing to output file {file_path}: {e}. Exiting.")
+            logging.critical(
+                "Error writing to output file %s: %s. Exiting.", file_path, e
+            )
             return 1
         except Exception as e:
             logging.critical(
-                f"An unexpected error occurred while writing {file_path}: {e}. Exiting."
+                "An unexpected error occurred while writing %s: %s. Exiting.",
+                file_path,
+                e,
             )
             return 1
 
     def replace_env_vars(self, data: Any) -> Any:
+        """
+        Substitutes '$VAR' string values with the matching environment variable
+        (looked up upper-cased). Other strings containing '$' are left alone.
+
+        `data` is never modified: containers along the path to a substituted
+        value are copied, and when nothing is substituted `data` itself is
+        returned.
+        """
+        return self._substitute_env_vars(data, os.environ)
+
+    def _substitute_env_vars(self, data: Any, env) -> Any:
         if isinstance(data, dict):
-            return {k: self.replace_env_vars(v) for k, v in data.items()}
+            items = data.items()
         elif isinstance(data, list):
-            return [self.replace_env_vars(elem) for elem in data]
-        elif isinstance(data, str) and data.startswith("$"):
-            env_var_name = data[1:].upper()
-            if env_var_name in os.environ:
-                return os.environ[env_var_name]
+            items = enumerate(data)
+        elif isinstance(data, str):
+            m = _ENV_VAR_RE.fullmatch(data)
+            return self._lookup_env_var(m.group(1), data, env) if m else data
+        else:
+            return data
+
+        match = _ENV_VAR_RE.fullmatch
+        updated = None
+        for key, value in items:
+            if isinstance(value, (dict, list)):
+                new_value = self._substitute_env_vars(value, env)
+            elif isinstance(value, str) and (m := match(value)):
+                new_value = self._lookup_env_var(m.group(1), value, env)
             else:
-                self.validation_issues.append(
-                    f"Error: Required environment variable '{env_var_name}' not found for string '{data}'."
-                )
-                return data  # Return original string or raise an error immediately if you want to fail hard
-
-        return data
+                continue
+            if new_value is not value:
+                if updated is None:
+                    updated = data.copy()
+                updated[key] = new_value
+        return data if updated is None else updated
+
+    def _lookup_env_var(self, name: str, value: str, env) -> str:
+        env_var_name = name.upper()
+        if env_var_name in env:
+            return env[env_var_name]
+        self._issue(
+            "Error: Required environment variable '%s' not found for string '%s'.",
+            env_var_name,
+            value,
+        )
+        return value  # Return original string or raise an error immediately if you want to fail hard
 
     def render(self) -> int:
         """
@@ -399,25 +633,33 @@ class ConfigManager:
         base_config = self.read_yaml_file(base_config_path)
         if base_config is None:
             logging.critical(
-                f"Failed to load base configuration from {base_config_path}. Cannot proceed."
+                "Failed to load base configuration from %s. Cannot proceed.",
+                base_config_path,
             )
             return 1
 
         if not isinstance(base_config, dict):
-            self.validation_issues.append(
-                f"Error: Invalid format for {base_config_path}: "
-                f"Expected a dictionary at root, but got {type(base_config).__name__}. Cannot proceed."
+            self._issue(
+                "Error: Invalid format for %s: Expected a dictionary at root, but got %s. Cannot proceed.",
+                base_config_path,
+                type(base_config).__name__,
             )
             return 1
 
-        alertmanager_config: Dict[str, Any] = copy.deepcopy(base_config)
-        logging.info(f"Base configuration loaded successfully from {base_config_path}.")
+        # The loaded tree may be shared with the parse cache, so only the
+        # mappings modified below are copied.
+        alertmanager_config: Dict[str, Any] = {**base_config}
+        if isinstance(base_config.get("route"), dict):
+            alertmanager_config["route"] = {**base_config["route"]}
+        logging.info(
+            "Base configuration loaded successfully from %s.", base_config_path
+        )
 
         # --- Populate master receiver list with base config receivers ---
         if "receivers" in base_config:
             if not isinstance(base_config["receivers"], list):
-                self.validation_issues.append(
-                    f"Error: 'receivers' in '{base_config_path}' must be a list."
+                self._issue(
+                    "Error: 'receivers' in '%s' must be a list.", base_config_path
                 )
             else:
                 for receiver in base_config["receivers"]:
@@ -430,8 +672,8 @@ class ConfigManager:
 
         if not isinstance(routing_config_from_folders, dict):
             logging.critical(
-                "Internal error: find_and_load_routing_configs returned unexpected type",
-                f"Expected dict, got {type(routing_config_from_folders).__name__}. Exiting.",
+                "Internal error: find_and_load_routing_configs returned unexpected type. Expected dict, got %s. Exiting.",
+                type(routing_config_from_folders).__name__,
             )
             return 1
 
@@ -442,7 +684,8 @@ class ConfigManager:
             data["data"] for data in self.all_defined_receivers.values()
         ]
         logging.debug(
-            f"Final receivers list consolidated. Total: {len(alertmanager_config['receivers'])} items."
+            "Final receivers list consolidated. Total: %s items.",
+            len(alertmanager_config["receivers"]),
         )
 
         # Integrate routes and time_intervals (already validated for references during load)
@@ -450,8 +693,8 @@ class ConfigManager:
             alertmanager_config["route"], dict
         ):
             logging.warning(
-                f"Key 'route' not found or not a dictionary in {base_config_path}. "
-                "Initializing 'route' as an empty dictionary."
+                "Key 'route' not found or not a dictionary in %s. Initializing 'route' as an empty dictionary.",
+                base_config_path,
             )
             alertmanager_config["route"] = {}
 
@@ -459,8 +702,8 @@ class ConfigManager:
             alertmanager_config["route"]["routes"], list
         ):
             logging.warning(
-                f"Key 'route.routes' not found or not a list in {base_config_path}. "
-                "Initializing 'route.routes' as an empty list."
+                "Key 'route.routes' not found or not a list in %s. Initializing 'route.routes' as an empty list.",
+                base_config_path,
             )
             alertmanager_config["route"]["routes"] = []
 
@@ -471,28 +714,32 @@ class ConfigManager:
             if "receiver" in alertmanager_config["route"]:
                 root_receiver = alertmanager_config["route"]["receiver"]
                 if not isinstance(root_receiver, str) or not root_receiver:
-                    self.validation_issues.append(
-                        f"Error: Invalid or empty receiver name at 'route.receiver' in file '{base_config_path}'."
+                    self._issue(
+                        "Error: Invalid or empty receiver name at 'route.receiver' in file '%s'.",
+                        base_config_path,
                     )
                 elif root_receiver not in self.all_defined_receivers:
-                    self.validation_issues.append(
-                        f"Error: Root receiver '{root_receiver}' referenced at 'route.receiver' "
-                        f"in file '{base_config_path}' is not defined in any 'receivers' section."
+                    self._issue(
+                        "Error: Root receiver '%s' referenced at 'route.receiver' in file '%s' is not defined in any 'receivers' section.",
+                        root_receiver,
+                        base_config_path,
                     )
 
-            alertmanager_config["route"]["routes"].extend(
-                routing_config_from_folders["routes"]
+            alertmanager_config["route"]["routes"] = (
+                alertmanager_config["route"]["routes"]
+                + routing_config_from_folders["routes"]
             )
             logging.debug(
-                f"Successfully extended 'routes' under 'route' with {len(routing_config_from_folders['routes'])} new items."
+                "Successfully extended 'routes' under 'route' with %s new items.",
+                len(routing_config_from_folders["routes"]),
             )
 
         if "time_intervals" not in alertmanager_config or not isinstance(
             alertmanager_config["time_intervals"], list
         ):
             logging.warning(
-                f"Key 'time_intervals' not found or not a list in {base_config_path}. "
-                "Initializing 'time_intervals' as an empty list."
+                "Key 'time_intervals' not found or not a list in %s. Initializing 'time_intervals' as an empty list.",
+                base_config_path,
             )
             alertmanager_config["time_intervals"] = []
 
@@ -505,33 +752,29 @@ class ConfigManager:
                 try:
                     existing_intervals.add_item(interval)
                 except ValueError as e:
-                    self.validation_issues.append(
-                        f"Error adding time_interval from file: {e}"
+                    self._issue(
+                        "Error adding time_interval from file: %s", e, fatal=False
                     )
                     # Don't return here; collect all errors first
             alertmanager_config["time_intervals"] = existing_intervals.get_all_items()
             logging.debug(
-                f"Successfully merged 'time_intervals'. Total: {len(alertmanager_config['time_intervals'])} items."
+                "Successfully merged 'time_intervals'. Total: %s items.",
+                len(alertmanager_config["time_intervals"]),
             )
 
-        # --- Final Validation Check (Collect all errors) ---
-        if self.validation_issues:
-            logging.error("Configuration generation failed with the following issues:")
-            has_fatal_errors = False
-            for issue in self.validation_issues:
-                logging.error(f"- {issue}")
-                if issue.startswith("Error:"):
-                    has_fatal_errors = True
-
-            if has_fatal_errors:
-                logging.critical(
-                    "Fatal errors found during validation. Aborting configuration generation."
-                )
-                return 1
-            else:
-                logging.warning(
-                    "Validation completed with warnings. Proceeding with configuration generation."
-                )
+        # --- Final Validation Check (issues were logged as they were found) ---
+        if self.fatal_count:
+            logging.critical(
+                "Fatal errors found during validation (%s errors, %s warnings). Aborting configuration generation.",
+                self.fatal_count,
+                self.warning_count,
+            )
+            return 1
+        elif self.warning_count:
+            logging.warning(
+                "Validation completed with %s warnings. Proceeding with configuration generation.",
+                self.warning_count,
+            )
         else:
             logging.info("Configuration passed all validation checks.")
 
@@ -547,5 +790,5 @@ def render(args: Namespace) -> int:
         config = ConfigManager(args)
         return config.render()
     except Exception as e:
-        logging.critical(f"Error rendering configuration: {e}")
+        logging.critical("Error rendering configuration: %s", e)
         return 1
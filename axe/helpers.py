@@ -1,8 +1,64 @@
-import yaml
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
 from typing import Dict, Any
 
+# Parsed configurations keyed by a BLAKE2b digest of the file contents, kept
+# in least-recently-used order. Cached configurations are shared, so callers
+# must not modify them.
+_PARSE_CACHE_SIZE = 128
+_parse_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 
-def parse_alertmanager_config(config_path: str) -> Dict[str, Any]:
-    with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
+
+def parse_alertmanager_config(config_path: str, cache: bool = False) -> Dict[str, Any]:
+    """
+    Parses an Alertmanager configuration file. With `cache` enabled, the parsed
+    configuration is pickled to `<config_path>.pkl` and reused while the
+    configuration file's modification time and size are unchanged.
+    """
+    if not cache:
+        return _load_yaml(config_path)
+
+    stat = os.stat(config_path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cache_path = f"{config_path}.pkl"
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, config = pickle.load(f)
+        if cached_key == key:
+            return config
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        # Missing or unreadable cache files are rebuilt below
+        pass
+
+    config = _load_yaml(config_path)
+    try:
+        with open(cache_path, "wb") as f:
+            pickle.dump((key, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        # Caching is best effort, e.g. for configs in read-only directories
+        pass
+    return config
+
+
+def _load_yaml(config_path: str) -> Dict[str, Any]:
+    with open(config_path, "rb") as f:
+        data = f.read()
+
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    config = _parse_cache.get(digest)
+    if config is not None:
+        _parse_cache.move_to_end(digest)
+        return config
+
+    # yaml is imported here so that importing axe modules stays cheap
+    import yaml
+
+    Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    config = yaml.load(data, Loader=Loader)
+    if config is not None:
+        _parse_cache[digest] = config
+        if len(_parse_cache) > _PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
     return config
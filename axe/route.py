@@ -0,0 +1,473 @@
+import re
+import sys
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, Any, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from rich.tree import Tree
+
+# Characters that make up a matcher operator.
+_OPERATOR_CHARS = "=!~"
+
+# Maximum number of (pattern, label value) results kept in a regex cache
+# before it is cleared.
+_REGEX_CACHE_SIZE = 10_000
+
+# Backreferences can't be fused into a joint pattern since group numbers shift.
+_BACKREFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+# Flags of a pattern without inline flags. Patterns with other flags aren't
+# fused, since older Pythons apply inline global flags like (?i) to the whole
+# joint pattern.
+_DEFAULT_REGEX_FLAGS = re.compile("").flags
+
+
+def print(*args: Any, **kwargs: Any) -> None:
+    # Rich is only imported once something is actually printed
+    from rich import print as rich_print
+
+    rich_print(*args, **kwargs)
+
+
+def _split_matcher(matcher_str: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Splits a matcher string such as 'severity = "critical"' into its label,
+    operator and value with plain string operations. The operator is the
+    whole run of '=', '!' and '~' characters after the label, so unknown
+    operators like '==' are returned for the caller to reject. Returns None
+    if there is no operator or the label isn't a valid label name.
+    """
+    start = -1
+    for char in _OPERATOR_CHARS:
+        index = matcher_str.find(char)
+        if index != -1 and (start == -1 or index < start):
+            start = index
+    if start == -1:
+        return None
+
+    label = matcher_str[:start].strip()
+    if not (label.isidentifier() and label.isascii()):
+        return None
+
+    end = start + 1
+    while end < len(matcher_str) and matcher_str[end] in _OPERATOR_CHARS:
+        end += 1
+    return label, matcher_str[start:end], matcher_str[end:].strip()
+
+
+def intern_string(value: Any) -> Any:
+    """Interns strings so label lookups and comparisons can short-circuit on identity."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _fuse_regex_matchers(
+    matchers: List[Optional[Tuple[str, str, Any]]],
+) -> List[Optional[Tuple[str, str, Any]]]:
+    """
+    Combines several `=~` matchers on the same label into one pattern made of
+    lookaheads, so the label value goes through the regex engine once. Each
+    lookahead scans forward like `search` does. Groups of patterns that can't
+    be combined are left as they are. The joint pattern is anchored at the
+    start so a failed search isn't retried at every offset.
+    """
+    patterns_by_label: Dict[str, List[re.Pattern]] = {}
+    for matcher in matchers:
+        if matcher is not None and matcher[1] == "=~":
+            patterns_by_label.setdefault(matcher[0], []).append(matcher[2])
+
+    fused = {}
+    for label, patterns in patterns_by_label.items():
+        if len(patterns) < 2 or any(
+            p.flags != _DEFAULT_REGEX_FLAGS or _BACKREFERENCE_RE.search(p.pattern)
+            for p in patterns
+        ):
+            continue
+        try:
+            fused[label] = re.compile(
+                r"\A" + "".join(f"(?=(?s:.*?)(?:{p.pattern}))" for p in patterns)
+            )
+        except re.error:
+            # e.g. clashing group names
+            continue
+
+    if not fused:
+        return matchers
+    result = [m for m in matchers if m is None or m[1] != "=~" or m[0] not in fused]
+    result.extend((label, "=~", pattern) for label, pattern in fused.items())
+    return result
+
+
+def route_matches(
+    match_items: Tuple[Tuple[str, Any], ...],
+    match_re_items: Tuple[Tuple[str, Optional[re.Pattern]], ...],
+    matchers: List[Optional[Tuple[str, str, Any]]],
+    alert_labels: Dict[str, Any],
+    search: Callable[[re.Pattern, str], bool],
+    report: Optional[Callable[[str, str, Any, Any], None]] = None,
+) -> bool:
+    """
+    Checks alert labels against a route's pre-processed 'match', 'match_re'
+    and 'matchers' criteria, returning on the first mismatch. `report`, if
+    given, is called for every matcher that matched.
+    """
+    # Check 'match' criteria (exact string match)
+    for key, value in match_items:
+        alert_value = alert_labels.get(key)
+        # A missing label only matches an empty value
+        if alert_value != value and (alert_value is not None or value != ""):
+            return False
+
+    # Check 'match_re' criteria (regex match)
+    for key, pattern in match_re_items:
+        if pattern is None or not search(pattern, alert_labels.get(key, "")):
+            return False
+
+    # Check 'matchers' criteria (parsed once when the route is built)
+    for matcher in matchers:
+        if matcher is None:
+            return False
+        label, operator, pattern_or_value = matcher
+        alert_value = alert_labels.get(label, "")
+        if operator == "=":
+            result = alert_value == pattern_or_value
+        elif operator == "!=":
+            result = alert_value != pattern_or_value
+        elif operator == "=~":
+            result = search(pattern_or_value, alert_value)
+        else:
+            result = not search(pattern_or_value, alert_value)
+        if not result:
+            return False
+        if report is not None:
+            report(label, operator, pattern_or_value, alert_value)
+
+    return True
+
+
+def _matcher_cost(matcher: Optional[Tuple[str, str, Any]]) -> int:
+    """Sort key ordering parsed matchers from cheapest to most expensive."""
+    if matcher is None:
+        return 0
+    return 1 if matcher[1] in ("=", "!=") else 2
+
+
+# Labels, templates and styles of the entries shown under each route in the
+# tree, in display order. Label parts are (text, style) pairs shared by every
+# route; item templates are filled in with str.format_map.
+_SEPARATOR = (" ", "")
+_GROUP_BY_LABEL = ("Group By:", "bold green")
+_CONTINUE_LABEL = ("Continue: true", "bold green")
+# (attribute, heading, item template, item style)
+_LIST_ENTRIES = (
+    ("match", ("Match", "bold yellow"), "{key} = {value}", "yellow"),
+    ("match_re", ("Match RE", "bold magenta"), "{key} =~ {value}", "magenta"),
+    ("matchers", ("Matchers", "bold cyan"), "{value}", "cyan"),
+)
+# (attribute, label, value style)
+_VALUE_ENTRIES = (
+    ("group_wait", ("Wait:", "bold yellow"), "yellow"),
+    ("group_interval", ("Group Interval:", "bold yellow"), "yellow"),
+    ("repeat_interval", ("Repeat Interval:", "bold yellow"), "yellow"),
+)
+
+
+class Route:
+    """
+    A node of an Alertmanager routing tree, shared by the evaluator and the
+    tree renderer. Matchers are parsed and compiled once when it is built.
+    """
+
+    # Routes are built per configuration node, so slots keep them small and
+    # make attribute access a fixed offset instead of a dict lookup.
+    __slots__ = (
+        "verbose",
+        "_regex_cache",
+        "receiver",
+        "group_by",
+        "match",
+        "match_re",
+        "matchers",
+        "continue_set",
+        "continue_flag",
+        "group_wait",
+        "group_interval",
+        "repeat_interval",
+        "_match_items",
+        "_match_re_compiled",
+        "_parsed_matchers",
+        "_match_re_items",
+        "_never_matches",
+        "_routes_raw",
+        "_routes",
+        "parent",
+        "_has_matchers",
+        "_has_children",
+    )
+
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        parent: Optional["Route"] = None,
+        verbose: bool = False,
+        regex_cache: Optional[Dict[Tuple[int, str], bool]] = None,
+    ):
+        self.verbose = verbose
+        # Results of regex searches keyed by (id(pattern), label value), shared
+        # by every route in the tree. Patterns live as long as their routes,
+        # so their ids stay valid for the lifetime of the cache.
+        self._regex_cache = {} if regex_cache is None else regex_cache
+        self.receiver = intern_string(data.get("receiver", ""))
+        # Receivers, label names and intervals repeat across sibling routes,
+        # so interning lets every route share a single copy of each string.
+        self.group_by = [intern_string(label) for label in data.get("group_by") or []]
+        self.match = {
+            intern_string(k): intern_string(v)
+            for k, v in (data.get("match") or {}).items()
+        }
+        self.match_re = {
+            intern_string(k): v for k, v in (data.get("match_re") or {}).items()
+        }
+        # Keys left empty in YAML load as None and are treated as absent
+        self.matchers = data.get("matchers") or []
+        # Evaluation continues past the root route unless told otherwise, but
+        # only an explicit `continue: true` is displayed in the tree.
+        self.continue_set = bool(data.get("continue", False))
+        if parent is None:
+            self.continue_flag = data.get("continue", True)
+        else:
+            self.continue_flag = data.get("continue", False)
+        self.group_wait = intern_string(data.get("group_wait", ""))
+        self.group_interval = intern_string(data.get("group_interval", ""))
+        self.repeat_interval = intern_string(data.get("repeat_interval", ""))
+
+        # Predicates are stored as tuples so matching iterates them directly
+        # instead of going through dict views.
+        self._match_items: Tuple[Tuple[str, Any], ...] = tuple(self.match.items())
+
+        # Regexes are compiled once here rather than on every evaluation.
+        # Invalid patterns are stored as None and never match.
+        self._match_re_compiled = {
+            key: self._compile_pattern(pattern, key, always_report=True)
+            for key, pattern in self.match_re.items()
+        }
+        # Invalid matchers (which never match) and cheap exact comparisons are
+        # checked before regex matchers so mismatches exit early. Verbose runs
+        # keep each regex separate so every matcher is reported on its own.
+        parsed_matchers = [self._parse_matcher(m) for m in self.matchers]
+        if not verbose:
+            parsed_matchers = _fuse_regex_matchers(parsed_matchers)
+        self._parsed_matchers = sorted(parsed_matchers, key=_matcher_cost)
+        self._match_re_items = tuple(self._match_re_compiled.items())
+        self._never_matches = self._has_conflicting_equalities()
+
+        # Sub-routes are built on first access to `routes`
+        self._routes_raw = data.get("routes") or []
+        self._routes: Optional[List["Route"]] = None
+        self.parent = parent
+
+        self._has_matchers = bool(self.match or self.match_re or self.matchers)
+        self._has_children = bool(self._routes_raw)
+
+    @property
+    def routes(self) -> List["Route"]:
+        """
+        The sub-routes, built from the raw configuration when first accessed.
+        Each level is built on demand, so walking a deep tree never recurses
+        and callers that only look at the top of the tree skip the rest.
+        """
+        routes = self._routes
+        if routes is None:
+            routes = self._routes = [
+                Route(child, self, self.verbose, self._regex_cache)
+                for child in self._routes_raw
+            ]
+        return routes
+
+    def print_verbose(self, message: str):
+        if self.verbose:
+            print(message)
+
+    def _has_conflicting_equalities(self) -> bool:
+        """Returns True if two exact predicates require different values for a label."""
+        required: Dict[str, Any] = {}
+        equalities = list(self._match_items)
+        equalities.extend(
+            (m[0], m[2]) for m in self._parsed_matchers if m and m[1] == "="
+        )
+        for label, value in equalities:
+            if label in required and required[label] != value:
+                return True
+            required.setdefault(label, value)
+        return False
+
+    def _compile_pattern(
+        self, pattern: str, label: str, always_report: bool = False
+    ) -> Optional[re.Pattern]:
+        try:
+            return re.compile(pattern)
+        except (re.error, TypeError) as e:
+            message = f"[red]Error: Invalid regex pattern '{pattern}' for label '{label}': {e}[/red]"
+            if always_report:
+                print(message)
+            else:
+                self.print_verbose(message)
+            return None
+
+    def _search(self, pattern: re.Pattern, value: str) -> bool:
+        """Returns whether `pattern` is found in `value`, caching the result."""
+        key = (id(pattern), value)
+        cache = self._regex_cache
+        result = cache.get(key)
+        if result is None:
+            if len(cache) >= _REGEX_CACHE_SIZE:
+                cache.clear()
+            result = cache[key] = pattern.search(value) is not None
+        return result
+
+    def _parse_matcher(self, matcher_str: Any) -> Optional[Tuple[str, str, Any]]:
+        """
+        Parses an Alertmanager matcher string (e.g., 'severity = "critical"') into
+        a (label, operator, value) tuple. For the regex operators the value is a
+        compiled pattern. Returns None for matchers that can never match.
+        """
+        parts = _split_matcher(matcher_str) if isinstance(matcher_str, str) else None
+        if parts is None:
+            self.print_verbose(
+                f"[red]Invalid matcher format: '{matcher_str}'. Skipping.[/red]",
+            )
+            return None
+
+        label, operator, pattern_or_value = parts
+        label = sys.intern(label)
+
+        # Remove quotes from value if present
+        if pattern_or_value.startswith('"') and pattern_or_value.endswith('"'):
+            pattern_or_value = pattern_or_value[1:-1]
+
+        if operator in ("=", "!="):
+            return label, operator, sys.intern(pattern_or_value)
+        if operator in ("=~", "!~"):
+            pattern = self._compile_pattern(pattern_or_value, label)
+            return None if pattern is None else (label, operator, pattern)
+
+        self.print_verbose(
+            f"[red]Unknown operator '{operator}' in matcher: '{matcher_str}'. Skipping.[/red]",
+        )
+        return None
+
+    def matches_alert(
+        self, alert_labels: Dict[str, Any], log: Optional[List[str]] = None
+    ) -> bool:
+        """
+        Checks if the current route matches the given alert based on its
+        'match', 'match_re', and 'matchers' criteria.
+        If 'verbose' is True, detailed matcher logs are printed, or appended
+        to `log` when one is given.
+        """
+        # Routes requiring two different values for a label can never match
+        if self._never_matches:
+            return False
+        # Catch-all routes match without looking at the labels
+        if not self._has_matchers and not self.verbose:
+            return True
+
+        report = None
+        if self.verbose:
+            emit = print if log is None else log.append
+            report = partial(self._report_matcher, emit)
+        if not route_matches(
+            self._match_items,
+            self._match_re_items,
+            self._parsed_matchers,
+            alert_labels,
+            self._search,
+            report,
+        ):
+            return False
+
+        if self.verbose:
+            emit("[green]✓[/green] All matchers matched successfully")
+
+        return True
+
+    def _report_matcher(
+        self,
+        emit: Callable[[str], None],
+        label: str,
+        operator: str,
+        pattern_or_value: Any,
+        alert_value: Any,
+    ) -> None:
+        shown = getattr(pattern_or_value, "pattern", pattern_or_value)
+        emit(
+            f'  [green]✓[/green] Matcher matched: [bold cyan]{label}[/bold cyan] {operator} [yellow]"{shown}"[/yellow]',
+        )
+        emit(
+            f'    Label: [cyan]{label}[/cyan], Alert value: [yellow]"{alert_value}"[/yellow], Pattern: [yellow]"{shown}"[/yellow]',
+        )
+
+    def to_tree(self, tree: "Tree") -> None:
+        from rich.text import Text
+
+        # Walk the routes depth-first with an explicit stack of
+        # (route, parent tree node) pairs instead of recursing. Each route's
+        # node, criteria and intervals are emitted in this single pass from
+        # styled Text objects, so Rich doesn't have to parse markup.
+        stack = [(self, tree)]
+        while stack:
+            route, parent_node = stack.pop()
+            route_node = parent_node.add(Text(str(route.receiver), style="bold blue"))
+            for label, children in route._entries():
+                if len(label) == 1:
+                    entry_node = route_node.add(Text(*label[0]))
+                else:
+                    entry_node = route_node.add(Text.assemble(*label))
+                for text, style in children:
+                    entry_node.add(Text(text, style=style))
+            # Push children reversed so they are added in configuration order
+            stack.extend((child, route_node) for child in reversed(route.routes))
+
+    def to_plain(self) -> Iterator[str]:
+        """Yields the route tree as indented plain-text lines, without Rich."""
+        stack = [(self, "")]
+        while stack:
+            route, indent = stack.pop()
+            yield f"{indent}{route.receiver}"
+            for label, children in route._entries():
+                yield f"{indent}  {''.join(text for text, _ in label)}"
+                for text, _ in children:
+                    yield f"{indent}    {text}"
+            stack.extend((child, indent + "  ") for child in reversed(route.routes))
+
+    def _entries(self) -> Iterator[Tuple[Tuple[Tuple[str, str], ...], List]]:
+        """
+        Yields this route's criteria and intervals as (label, children) pairs,
+        where the label is a tuple of (text, style) parts and children is a
+        list of (text, style) pairs.
+        """
+        if self.group_by:
+            group_by = ", ".join(str(label) for label in self.group_by)
+            yield (_GROUP_BY_LABEL, _SEPARATOR, (group_by, "green")), []
+
+        for attribute, heading, template, style in _LIST_ENTRIES:
+            items = getattr(self, attribute)
+            if not items:
+                continue
+            if isinstance(items, dict):
+                children = [
+                    (template.format_map({"key": key, "value": value}), style)
+                    for key, value in items.items()
+                ]
+            else:
+                children = [
+                    (template.format_map({"value": value}), style) for value in items
+                ]
+            yield (heading,), children
+
+        if self.continue_set:
+            yield (_CONTINUE_LABEL,), []
+
+        for attribute, label, style in _VALUE_ENTRIES:
+            value = getattr(self, attribute)
+            if value:
+                yield (label, _SEPARATOR, (str(value), style)), []
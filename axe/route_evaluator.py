@@ -1,268 +1,375 @@
-import argparse
 import json
-import yaml
-import re
-from typing import Dict, Any, List, Optional
-from rich.console import Console
-from rich import print  # Keep this for rich.print
+from array import array
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Tuple
 from .helpers import parse_alertmanager_config
+from .route import Route, intern_string, print
 
+if TYPE_CHECKING:
+    import argparse
 
-class Route:
-    def __init__(
-        self,
-        data: Dict[str, Any],
-        parent: Optional["Route"] = None,
-        verbose: bool = False,
-    ):
-        self.receiver = data.get("receiver", "default")
-        self.group_by = data.get("group_by", [])
-        self.match = data.get("match", {})
-        self.match_re = data.get("match_re", {})
-        self.matchers = data.get("matchers", [])
-        if parent is None:
-            self.continue_flag = data.get("continue", True)
-        else:
-            self.continue_flag = data.get("continue", False)
+# Maximum number of evaluation results memoized by a RouteEvaluator before
+# its result cache is cleared.
+_RESULT_CACHE_SIZE = 10_000
 
-        self.routes = [Route(r, self, verbose) for r in data.get("routes", [])]
-        self.parent = parent
-        self.verbose = verbose
 
-    def print_verbose(self, message: str):
-        if self.verbose:
-            print(message)
+class RouteEvaluator:
+    def __init__(self, route_data: Dict[str, Any], verbose: bool = False):
+        self.verbose = verbose
+        self._log_buffer: List[str] = []
+        self._console = None
+        self._regex_cache: Dict[Tuple[int, str], bool] = {}
+        self.root_route = Route(
+            data=route_data, verbose=self.verbose, regex_cache=self._regex_cache
+        )
+        self._flatten(self.root_route)
 
-    def matches_alert(self, alert_labels: Dict[str, str]) -> bool:
+    def _flatten(self, root_route: Route) -> None:
         """
-        Checks if the current route matches the given alert based on its
-        'match', 'match_re', and 'matchers' criteria.
-        If 'verbose' is True, detailed matcher logs are printed.
+        Compiles the route tree into parallel arrays indexed by route position
+        (depth-first, in configuration order), so evaluation walks flat arrays
+        instead of chasing child lists. Index 0 is the root route; -1 marks a
+        missing parent, child or sibling.
         """
-        # Check 'match' criteria (exact string match)
-        for key, value in self.match.items():
-            alert_value = alert_labels.get(key, "")
-            if alert_value != value:
-                return False
-
-        # Check 'match_re' criteria (regex match)
-        for key, pattern in self.match_re.items():
-            alert_value = alert_labels.get(key, "")
-            try:
-                if not bool(re.search(pattern, alert_value)):
-                    return False
-            except re.error as e:
-                print(
-                    f"[red]Error: Invalid regex pattern '{pattern}' for label '{key}': {e}[/red]"
-                )
-                return False
-
-        # Check 'matchers' criteria (parsed expressions)
-        for matcher_str in self.matchers:
-            if not self._evaluate_matcher_string(matcher_str, alert_labels):
-                return False
-
-        self.print_verbose("[green]✓[/green] All matchers matched successfully")
-
-        return True
-
-    def _evaluate_matcher_string(
-        self, matcher_str: str, alert_labels: Dict[str, str]
-    ) -> bool:
-        """Evaluates a single Alertmanager matcher string (e.g., 'severity = "critical")."""
-        match = re.match(
-            r"^\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*([=!~]+)\s*(.*)\s*$", matcher_str
-        )
-        if not match:
-            self.print_verbose(
-                f"[red]Invalid matcher format: '{matcher_str}'. Skipping.[/red]",
-            )
-            return False
-
-        label, operator, pattern_or_value = match.groups()
-        alert_value = alert_labels.get(label, "")
-
-        # Remove quotes from value if present
-        if pattern_or_value.startswith('"') and pattern_or_value.endswith('"'):
-            pattern_or_value = pattern_or_value[1:-1]
-
-        try:
-            if operator == "=":
-                result = alert_value == pattern_or_value
-            elif operator == "!=":
-                result = alert_value != pattern_or_value
-            elif operator == "=~":
-                result = bool(re.search(pattern_or_value, alert_value))
-            elif operator == "!~":
-                result = not bool(re.search(pattern_or_value, alert_value))
+        self._routes: List[Route] = []
+        self._receivers: List[str] = []
+        self._matchers: List[Callable[[Dict[str, str]], bool]] = []
+        self._continue_flags = array("B")
+        self._first_child = array("i")
+        self._next_sibling = array("i")
+        self._parent = array("i")
+        # Maps each (label, value) pair required by a route's `match` block to
+        # the indexes of the routes requiring it, and counts those pairs per
+        # route, so routes whose exact matches cannot hold are ruled out before
+        # any of their matchers run.
+        self._exact_index: Dict[Tuple[str, Any], List[int]] = {}
+        self._exact_counts = array("i")
+
+        stack = [(root_route, -1)]
+        while stack:
+            route, parent_index = stack.pop()
+            index = len(self._routes)
+            self._routes.append(route)
+            # Routes without a receiver are reported as "default"
+            self._receivers.append(route.receiver or "default")
+            self._matchers.append(route.matches_alert)
+            self._continue_flags.append(bool(route.continue_flag))
+            self._first_child.append(-1)
+            self._next_sibling.append(-1)
+            self._parent.append(parent_index)
+            self._exact_counts.append(self._index_exact_matches(route, index))
+            if route._has_children:
+                # Push children reversed so they are numbered in configuration order
+                stack.extend((child, index) for child in reversed(route.routes))
+
+        # Link children now that every route has its index
+        last_child = {}
+        for index in range(1, len(self._routes)):
+            parent_index = self._parent[index]
+            if parent_index in last_child:
+                self._next_sibling[last_child[parent_index]] = index
             else:
-                self.print_verbose(
-                    f"[red]Unknown operator '{operator}' in matcher: '{matcher_str}'. Skipping.[/red]",
-                )
-                return False
-        except re.error as e:
-            self.print_verbose(
-                f"[red]Error: Invalid regex pattern '{pattern_or_value}' for label '{label}': {e}[/red]",
-            )
-            return False
-
-        if result:  # Only log successful matches
-            self.print_verbose(
-                f'  [green]✓[/green] Matcher matched: [bold cyan]{label}[/bold cyan] {operator} [yellow]"{pattern_or_value}"[/yellow]',
-            )
-            self.print_verbose(
-                f'    Label: [cyan]{label}[/cyan], Alert value: [yellow]"{alert_value}"[/yellow], Pattern: [yellow]"{pattern_or_value}"[/yellow]',
-            )
-
-        return result
-
-
-class RouteEvaluator:
-    def __init__(self, route_data: Dict[str, Any], verbose: bool = False):
-        self.verbose = verbose
-        self.root_route = Route(data=route_data, verbose=self.verbose)
+                self._first_child[parent_index] = index
+            last_child[parent_index] = index
+
+        self._exact_labels = tuple({label for label, _ in self._exact_index})
+
+        # Receivers are numbered in sorted order and each route carries its
+        # receiver's bit, so matched receivers are collected in an int bitmask
+        # and read back already sorted and deduplicated.
+        self._receiver_names: List[str] = sorted(set(self._receivers))
+        self._receiver_index: Dict[str, int] = {
+            name: i for i, name in enumerate(self._receiver_names)
+        }
+        self._receiver_bits: List[int] = [
+            1 << self._receiver_index[receiver] for receiver in self._receivers
+        ]
+
+        # Evaluation only depends on the labels some route refers to, so
+        # results are memoized by the alert's values for those labels.
+        relevant_labels = set()
+        for route in self._routes:
+            relevant_labels.update(route.match)
+            relevant_labels.update(route.match_re)
+            relevant_labels.update(m[0] for m in route._parsed_matchers if m)
+        self._relevant_labels: Tuple[str, ...] = tuple(sorted(relevant_labels))
+        self._result_cache: Dict[Tuple[Any, ...], List[str]] = {}
+
+    def _index_exact_matches(self, route: Route, index: int) -> int:
+        """Adds the route's `match` pairs to the exact index and returns their count."""
+        pairs = route._match_items
+        try:
+            hash(pairs)
+        except TypeError:
+            # Unhashable values can't be indexed; matches_alert handles them
+            return 0
+        for pair in pairs:
+            self._exact_index.setdefault(pair, []).append(index)
+        return len(pairs)
+
+    def _unmatched_exact_counts(self, alert_labels: Dict[str, str]) -> array:
+        """
+        Returns, per route, how many of its `match` pairs the alert does not
+        satisfy. Only routes with a count of zero need their matchers evaluated.
+        """
+        remaining = self._exact_counts[:]
+        exact_index = self._exact_index
+        for label in self._exact_labels:
+            # Missing labels compare as "" just like in matches_alert
+            try:
+                indexes = exact_index.get((label, alert_labels.get(label, "")), ())
+            except TypeError:
+                # Unhashable alert values never equal an indexed route value
+                continue
+            for index in indexes:
+                remaining[index] -= 1
+        return remaining
 
     def evaluate_alert(self, alert_labels: Dict[str, str]) -> List[str]:
-        matched_receivers = set()
-        self._traverse_and_match_recursive(
-            self.root_route, alert_labels, matched_receivers
-        )
-        return sorted(list(matched_receivers))
+        # Route label names are interned, so interning the alert's keys lets
+        # lookups match on identity
+        alert_labels = {intern_string(k): v for k, v in alert_labels.items()}
 
-    def print_verbose(self, message: str):
+        # Verbose runs always traverse so their diagnostics are printed
         if self.verbose:
-            print(message)
+            try:
+                return self._evaluate_uncached(alert_labels)
+            finally:
+                self._flush_log()
 
-    def _traverse_and_match_recursive(
-        self,
-        current_route: Route,
-        alert_labels: Dict[str, str],
-        matched_receivers: set,
-    ) -> bool:
+        signature = tuple(
+            alert_labels.get(label, "") for label in self._relevant_labels
+        )
+        cache = self._result_cache
+        try:
+            matched_receivers = cache.get(signature)
+        except TypeError:
+            # Unhashable label values can't be memoized
+            return self._evaluate_uncached(alert_labels)
+        if matched_receivers is None:
+            if len(cache) >= _RESULT_CACHE_SIZE:
+                cache.clear()
+            matched_receivers = cache[signature] = self._evaluate_uncached(alert_labels)
+        return list(matched_receivers)
+
+    def evaluate_alerts(self, alerts: List[Dict[str, str]]) -> List[List[str]]:
         """
-        Recursively traverses the routing tree. Returns True if this route (or one of its children)
-        ultimately leads to a receiver being added *and* it doesn't have `continue: true` to its siblings.
+        Evaluates a batch of alerts, returning their matched receivers in the
+        same order. The regex and result caches are shared across the batch,
+        so alerts repeating label values are mostly answered from cache.
         """
-        # Print the route being evaluated
-
-        self.print_verbose(
-            f"[bold magenta]  Evaluating Route (Receiver: {current_route.receiver})[/bold magenta]",
-        )
-        if current_route.match or current_route.match_re or current_route.matchers:
-            self.print_verbose(
-                "[bold magenta]  Route Matchers Defined:[/bold magenta]",
-            )
-            if current_route.match:
-                self.print_verbose(
-                    f"    match: {current_route.match}",
-                )
-            if current_route.match_re:
-                self.print_verbose(
-                    f"    match_re: {current_route.match_re}",
-                )
-            if current_route.matchers:
-                self.print_verbose(
-                    f"    matchers: {current_route.matchers}",
+        evaluate_alert = self.evaluate_alert
+        return [evaluate_alert(alert_labels) for alert_labels in alerts]
+
+    def _evaluate_uncached(self, alert_labels: Dict[str, str]) -> List[str]:
+        mask = self._traverse_and_match(alert_labels)
+        names = self._receiver_names
+        matched_receivers = []
+        while mask:
+            lowest = mask & -mask
+            matched_receivers.append(names[lowest.bit_length() - 1])
+            mask ^= lowest
+        return matched_receivers
+
+    def _log(self, message: str) -> None:
+        """Buffers a verbose diagnostic line until the evaluation finishes."""
+        self._log_buffer.append(message)
+
+    def _flush_log(self) -> None:
+        """Prints the buffered diagnostics with a single console write."""
+        if not self._log_buffer:
+            return
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        # Diagnostics carry their own markup; skip Rich's highlighter regexes
+        self._console.print("\n".join(self._log_buffer), highlight=False)
+        self._log_buffer.clear()
+
+    def _traverse_and_match(self, alert_labels: Dict[str, str]) -> int:
+        """
+        Traverses the flattened routing tree depth-first. A matched route's
+        receiver is added unless one of its children handled the alert and does
+        not have `continue: true`; such a child also stops evaluation of its
+        later siblings. Returns the bitmask of matched receivers, which is 0 if
+        the root route did not match.
+        Diagnostic output is only formatted and buffered when verbose is enabled.
+        """
+        verbose = self.verbose
+        receivers = self._receivers
+        continue_flags = self._continue_flags
+        first_child = self._first_child
+        next_sibling = self._next_sibling
+        parent = self._parent
+
+        unmatched = self._unmatched_exact_counts(alert_labels)
+        if not self._enter_route(0, alert_labels, unmatched):
+            return 0
+
+        receiver_bits = self._receiver_bits
+        matched_receivers = 0
+        # Routes whose evaluation was stopped by a child without continue
+        stopped = bytearray(len(receivers))
+        current = 0
+        child = first_child[0]
+        while True:
+            if child != -1:
+                # We're entering a child route, print a clear indicator
+                if verbose:
+                    self._log(
+                        f"\n[bold blue]Descending to Child Route (Receiver: {receivers[child]})[/bold blue]",
+                    )
+                if self._enter_route(child, alert_labels, unmatched):
+                    current = child
+                    child = first_child[child]
+                else:
+                    child = next_sibling[child]
+                continue
+
+            # All children evaluated (or evaluation stopped): settle this route
+            receiver = receivers[current]
+            if not stopped[current]:
+                # If no child handled and stopped, or if children handled but allowed continuation,
+                # then this route's receiver is relevant.
+                if verbose:
+                    self._log(f"[bold green]Adding receiver: {receiver}[/bold green]")
+                matched_receivers |= receiver_bits[current]
+            elif verbose:
+                self._log(
+                    f"[bold yellow]Skipping receiver {receiver} because a child handled and stopped.[/bold yellow]"
                 )
-        else:
-            self.print_verbose(
-                "[bold magenta]  (No specific matchers, acts as catch-all for its children)[/bold magenta]",
-            )
-        self.print_verbose(
-            f"[bold magenta]  Continue flag:[/bold magenta] {current_route.continue_flag}",
-        )
 
-        # Perform the match, passing verbose=True ONLY if this route matches
-        route_matched = current_route.matches_alert(alert_labels)
-
-        if not route_matched:
-            self.print_verbose(
-                f"[bold red]Route {current_route.receiver} did NOT match alert. Moving to next sibling/parent fallback.[/bold red]",
-            )
-            return False
-
-        print(f"[bold green]Route {current_route.receiver} MATCHED alert.[/bold green]")
-
-        child_handled_and_stopped = False
-        for child_route in current_route.routes:
-            # We're entering a child route, print a clear indicator
-            self.print_verbose(
-                f"\n[bold blue]Descending to Child Route (Receiver: {child_route.receiver})[/bold blue]",
-            )
-            if self._traverse_and_match_recursive(
-                child_route, alert_labels, matched_receivers
-            ):
-                # A child (or grandchild etc.) handled the alert.
-                # If that child's branch does *not* continue, then this current route's
-                # receiver is suppressed.
-                if not child_route.continue_flag:
-                    print(
-                        f"[bold yellow]  Child Route {child_route.receiver} handled alert and has continue: false.[/bold yellow]"
+            parent_index = parent[current]
+            if parent_index == -1:
+                break
+
+            # This route (or one of its children) handled the alert. If it does
+            # *not* continue, its parent's receiver is suppressed and the
+            # parent's remaining children are skipped.
+            if not continue_flags[current]:
+                if verbose:
+                    self._log(
+                        f"[bold yellow]  Child Route {receiver} handled alert and has continue: false.[/bold yellow]"
                     )
-                    print(
+                    self._log(
                         "[bold yellow]  Stopping further evaluation of THIS branch's siblings.[/bold yellow]"
                     )
-                    child_handled_and_stopped = True
-                    break  # Stop looking at siblings of the child if it handled and stopped
-                else:
-                    print(
-                        f"[bold purple]  Child Route {child_route.receiver} handled alert but has continue: true.[/bold purple]"
+                stopped[parent_index] = 1
+                child = -1
+            else:
+                if verbose:
+                    self._log(
+                        f"[bold purple]  Child Route {receiver} handled alert but has continue: true.[/bold purple]"
                     )
-                    print(
+                    self._log(
                         "[bold purple]  Parent's receiver still considered, and parent's siblings will be checked if current route has continue: true. [/bold purple]"
                     )
+                child = next_sibling[current]
+            current = parent_index
+
+        return matched_receivers
+
+    def _enter_route(
+        self, index: int, alert_labels: Dict[str, str], unmatched: array
+    ) -> bool:
+        """Evaluates a single route's matchers, printing details when verbose."""
+        if self.verbose:
+            self._print_route_details(index)
+
+        # Routes ruled out by the exact-match index skip their matchers
+        if unmatched[index]:
+            matched = False
+        elif self.verbose:
+            route = self._routes[index]
+            matched = route.matches_alert(alert_labels, self._log_buffer)
+        else:
+            matched = self._matchers[index](alert_labels)
+        if not matched:
+            if self.verbose:
+                self._log(
+                    f"[bold red]Route {self._receivers[index]} did NOT match alert. Moving to next sibling/parent fallback.[/bold red]",
+                )
+            return False
 
-        if not child_handled_and_stopped:
-            # If no child handled and stopped, or if children handled but allowed continuation,
-            # then this route's receiver is relevant.
-            print(f"[bold green]Adding receiver: {current_route.receiver}[/bold green]")
-            matched_receivers.add(current_route.receiver)
+        if self.verbose:
+            self._log(
+                f"[bold green]Route {self._receivers[index]} MATCHED alert.[/bold green]"
+            )
+        return True
+
+    def _print_route_details(self, index: int):
+        route = self._routes[index]
+        self._log(
+            f"[bold magenta]  Evaluating Route (Receiver: {self._receivers[index]})[/bold magenta]",
+        )
+        if route._has_matchers:
+            self._log("[bold magenta]  Route Matchers Defined:[/bold magenta]")
+            if route.match:
+                self._log(f"    match: {route.match}")
+            if route.match_re:
+                self._log(f"    match_re: {route.match_re}")
+            if route.matchers:
+                self._log(f"    matchers: {route.matchers}")
         else:
-            print(
-                f"[bold yellow]Skipping receiver {current_route.receiver} because a child handled and stopped.[/bold yellow]"
+            self._log(
+                "[bold magenta]  (No specific matchers, acts as catch-all for its children)[/bold magenta]",
             )
+        self._log(
+            f"[bold magenta]  Continue flag:[/bold magenta] {route.continue_flag}"
+        )
 
-        return True
 
+def evaluate(args: "argparse.Namespace") -> int:
+    import yaml
+    from rich.console import Console
 
-def evaluate(args: argparse.Namespace) -> int:
     try:
         # Parse configuration
-        route_config = parse_alertmanager_config(args.file_path)
+        route_config = parse_alertmanager_config(args.file_path, cache=args.cache)
 
-        # Parse alert
+        # Parse alert; a JSON array holds a batch of alerts
         if args.alert.endswith(".json"):
             with open(args.alert, "r") as f:
                 alert_data_string = f.read().strip()
-            alert_labels = json.loads(alert_data_string)
+            alert_data = json.loads(alert_data_string)
         else:
-            alert_labels = json.loads(args.alert)
-        # Create evaluator and evaluate alert
+            alert_data = json.loads(args.alert)
+        alerts = alert_data if isinstance(alert_data, list) else [alert_data]
+
+        # Create evaluator and evaluate alerts
         evaluator = RouteEvaluator(
             route_data=route_config.get("route", {}), verbose=args.verbose
         )
+        if args.verbose:
+            # Evaluate as each alert is shown so diagnostics print beneath it
+            results = (evaluator.evaluate_alert(alert) for alert in alerts)
+        else:
+            results = iter(evaluator.evaluate_alerts(alerts))
 
         console = Console()
         console.print("[bold underline]Alert Evaluation Process[/bold underline]")
-        console.print("\n[bold]Alert Labels:[/bold]")
-        for key, value in alert_labels.items():
-            console.print(f"  [cyan]{key}[/cyan]: [yellow]{value}[/yellow]")
-        console.print("\n" + "-" * 70 + "\n")
-
-        matched_receivers = evaluator.evaluate_alert(alert_labels)
-
-        # Print results
-        console.print("\n" + "-" * 70 + "\n")
-        console.print("[bold]Final Alert Evaluation Results[/bold]")
-        console.print("\nMatched Receivers:")
-        if matched_receivers:
-            for receiver in matched_receivers:
-                console.print(f"  [green]✓[/green] [bold blue]{receiver}[/bold blue]")
+        for alert_labels in alerts:
+            console.print("\n[bold]Alert Labels:[/bold]")
+            for key, value in alert_labels.items():
+                console.print(f"  [cyan]{key}[/cyan]: [yellow]{value}[/yellow]")
             console.print("\n" + "-" * 70 + "\n")
-        else:
-            console.print(
-                "  [red]No matching receivers found (check default receiver or matchers)[/red]"
-            )
+
+            matched_receivers = next(results)
+
+            # Print results
+            console.print("\n" + "-" * 70 + "\n")
+            console.print("[bold]Final Alert Evaluation Results[/bold]")
+            console.print("\nMatched Receivers:")
+            if matched_receivers:
+                for receiver in matched_receivers:
+                    console.print(
+                        f"  [green]✓[/green] [bold blue]{receiver}[/bold blue]"
+                    )
+                console.print("\n" + "-" * 70 + "\n")
+            else:
+                console.print(
+                    "  [red]No matching receivers found (check default receiver or matchers)[/red]"
+                )
 
     except FileNotFoundError as e:
         print(f"[red]Error: File not found: {e.filename}[/red]")
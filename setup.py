@@ -1,5 +1,16 @@
+import os
+
 from setuptools import setup, find_packages
 
+# Set AXE_USE_MYPYC=1 to compile the route matching module with mypyc (needs
+# mypy and a C compiler). By default axe is installed as pure Python.
+ext_modules = []
+if os.environ.get("AXE_USE_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    # axe has no __init__.py, so module names are resolved from this directory
+    ext_modules = mypycify(["--explicit-package-bases", "axe/route.py"])
+
 setup(
     name="axe",
     version="0.1.0",
@@ -7,6 +18,7 @@ setup(
     author="Thomas Nyambati",
     author_email="thomasnyambati@gmail.com",
     packages=["axe"],
+    ext_modules=ext_modules,
     install_requires=[
         "click>=8.0.0",
         "pyyaml>=6.0.2",
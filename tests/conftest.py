@@ -0,0 +1,52 @@
+import pytest
+import yaml
+
+from axe import helpers
+
+# Route configuration shared by the tests that exercise Route itself rather
+# than YAML parsing.
+CONFIG_YAML = """
+receiver: default-receiver
+group_by: [alertname]
+match:
+  severity: warning
+match_re:
+  instance: .*
+matchers:
+- name: region
+  value: us-east-1
+  isRegex: false
+continue: true
+group_wait: 30s
+group_interval: 5m
+repeat_interval: 3h
+routes:
+- receiver: critical-receiver
+  match:
+    severity: critical
+"""
+
+
+def pytest_configure(config):
+    # Registered here so the marks are known even without pytest-xdist or
+    # pytest-timeout installed
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run the marked tests on the same xdist worker"
+    )
+    config.addinivalue_line(
+        "markers", "timeout(seconds): fail the test if it runs longer than this"
+    )
+
+
+@pytest.fixture(scope="session")
+def default_config_dict():
+    """The shared route configuration, parsed once per test session."""
+    return yaml.load(CONFIG_YAML, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+@pytest.fixture(autouse=True)
+def clear_parse_cache():
+    """Keeps parsed configs from one test out of the next one's parse cache."""
+    helpers._parse_cache.clear()
+    yield
+    helpers._parse_cache.clear()
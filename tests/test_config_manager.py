@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 
+import os
+import tempfile
 import unittest
+import yaml
 from unittest.mock import patch, mock_open
 from argparse import Namespace
-from axe.config_manager import ConfigManager
+from axe.config_manager import ConfigManager, UniqueList
 
 
 class TestConfigManager(unittest.TestCase):
@@ -15,13 +18,215 @@ class TestConfigManager(unittest.TestCase):
         self.assertEqual(self.config_manager.args, self.args)
         self.assertEqual(self.config_manager.base_file, "base.yaml")
         self.assertEqual(self.config_manager.output_file, "alertmanager.yaml")
-        self.assertEqual(len(self.config_manager.validation_issues), 0)
+        self.assertEqual(self.config_manager.fatal_count, 0)
+        self.assertEqual(self.config_manager.warning_count, 0)
 
-    @patch("builtins.open", new_callable=mock_open, read_data="key: value")
-    def test_read_yaml_file(self, mock_file):
+    @patch("axe.config_manager.os.stat")
+    @patch("builtins.open", new_callable=mock_open, read_data=b"key: value")
+    def test_read_yaml_file(self, mock_file, mock_stat):
+        mock_stat.return_value = os.stat_result((0,) * 10)
         result = self.config_manager.read_yaml_file("test.yaml")
         self.assertEqual(result, {"key": "value"})
-        mock_file.assert_called_once_with("test.yaml", "r", encoding="utf-8")
+        mock_file.assert_called_once_with("test.yaml", "rb")
+
+    def test_read_yaml_file_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "test.yaml")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write("key: value")
+
+            with patch("axe.config_manager.yaml.load", wraps=yaml.load) as mock_load:
+                first = self.config_manager.read_yaml_file(file_path)
+                second = self.config_manager.read_yaml_file(file_path)
+                self.assertEqual(mock_load.call_count, 1)
+            self.assertEqual(first, {"key": "value"})
+            self.assertIs(first, second)
+
+            # A changed file must be parsed again
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write("key: other value")
+            self.assertEqual(
+                self.config_manager.read_yaml_file(file_path), {"key": "other value"}
+            )
+
+    @patch.dict(os.environ, {"SLACK_URL": "http://slack.example.com"})
+    def test_replace_env_vars(self):
+        data = {
+            "receivers": [
+                {"name": "slack", "url": "$slack_url"},
+                {"name": "other", "url": "$MISSING_URL"},
+                {"name": "price", "text": "$5.00"},
+            ]
+        }
+        with self.assertLogs(level="ERROR") as logs:
+            result = self.config_manager.replace_env_vars(data)
+        self.assertIsNot(result, data)
+        self.assertEqual(data["receivers"][0]["url"], "$slack_url")
+        self.assertIs(result["receivers"][1], data["receivers"][1])
+        self.assertEqual(result["receivers"][0]["url"], "http://slack.example.com")
+        self.assertEqual(result["receivers"][1]["url"], "$MISSING_URL")
+        self.assertEqual(result["receivers"][2]["text"], "$5.00")
+        self.assertEqual(self.config_manager.fatal_count, 1)
+        self.assertIn("MISSING_URL", logs.output[0])
+
+    def test_replace_env_vars_unchanged(self):
+        data = {"receivers": [{"name": "slack", "url": "http://slack.example.com"}]}
+        self.assertIs(self.config_manager.replace_env_vars(data), data)
+
+    def test_find_and_load_routing_configs(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.makedirs(os.path.join(tmp_dir, "team-a"))
+            os.makedirs(os.path.join(tmp_dir, "team-b"))
+            files = {
+                "base.yaml": "route:\n  receiver: default\n",
+                "team-a/config.yaml": (
+                    "receivers:\n- name: team-a\n"
+                    "routes:\n- receiver: team-a\n  match:\n    team: a\n"
+                ),
+                "team-b/config.yml": (
+                    "receivers:\n- name: team-b\ntime_intervals:\n- name: weekends\n"
+                ),
+                "team-b/notes.yaml": "description: not a routing file\n",
+            }
+            for name, content in files.items():
+                with open(os.path.join(tmp_dir, name), "w", encoding="utf-8") as f:
+                    f.write(content)
+
+            result = self.config_manager.find_and_load_routing_configs(tmp_dir)
+
+        self.assertEqual(
+            sorted(r["name"] for r in result["receivers"]), ["team-a", "team-b"]
+        )
+        self.assertEqual(
+            result["routes"], [{"receiver": "team-a", "match": {"team": "a"}}]
+        )
+        self.assertEqual(result["time_intervals"], [{"name": "weekends"}])
+        self.assertEqual(self.config_manager.fatal_count, 0)
+        self.assertEqual(self.config_manager.warning_count, 0)
+
+    def test_find_and_load_routing_configs_multi_document(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "teams.yaml"), "w") as f:
+                f.write(
+                    "---\nreceivers:\n- name: team-a\n"
+                    "routes:\n- receiver: team-a\n"
+                    "---\nreceivers:\n- name: team-b\n"
+                    "routes:\n  receiver: team-b\n"
+                )
+
+            result = self.config_manager.find_and_load_routing_configs(tmp_dir)
+
+        self.assertEqual([r["name"] for r in result["receivers"]], ["team-a", "team-b"])
+        self.assertEqual(
+            result["routes"], [{"receiver": "team-a"}, {"receiver": "team-b"}]
+        )
+        self.assertEqual(self.config_manager.fatal_count, 0)
+
+    def test_find_and_load_routing_configs_byte_order_mark(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(
+                os.path.join(tmp_dir, "teams.yaml"), "w", encoding="utf-8-sig"
+            ) as f:
+                # Large enough that only a routing key found next to the BOM
+                # gets it parsed
+                f.write("receivers:\n- name: team-a\n# " + "x" * 4096 + "\n")
+
+            result = self.config_manager.find_and_load_routing_configs(tmp_dir)
+
+        self.assertEqual(result["receivers"], [{"name": "team-a"}])
+        self.assertEqual(self.config_manager.fatal_count, 0)
+
+    def test_find_and_load_routing_configs_skips_unrelated_yaml(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "other.yaml"), "w") as f:
+                f.write("# " + "x" * 4096 + "\n- not: [valid\n")
+
+            with patch("axe.config_manager.yaml.load") as mock_load:
+                result = self.config_manager.find_and_load_routing_configs(tmp_dir)
+                mock_load.assert_not_called()
+
+        self.assertEqual(result, {"receivers": [], "routes": [], "time_intervals": []})
+        self.assertEqual(self.config_manager.fatal_count, 0)
+        self.assertEqual(self.config_manager.warning_count, 0)
+
+    def test_find_and_load_routing_configs_validates_small_files(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "list.yaml"), "w") as f:
+                f.write("- name: team-a\n")
+            with open(os.path.join(tmp_dir, "broken.yaml"), "w") as f:
+                f.write("- not: [valid\n")
+
+            result = self.config_manager.find_and_load_routing_configs(tmp_dir)
+
+        self.assertEqual(result, {"receivers": [], "routes": [], "time_intervals": []})
+        self.assertEqual(self.config_manager.fatal_count, 1)
+        self.assertEqual(self.config_manager.warning_count, 1)
+
+    def test_write_yaml_file(self):
+        data = {
+            "global": {"slack_api_url": "https://hooks.slack.com/" + "x" * 120},
+            "receivers": [{"name": "équipe"}],
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "alertmanager.yaml")
+            self.assertEqual(self.config_manager.write_yaml_file(data, file_path), 0)
+            with open(file_path, encoding="utf-8") as f:
+                content = f.read()
+
+        self.assertEqual(yaml.safe_load(content), data)
+        self.assertIn("name: équipe", content)
+        self.assertEqual(len(content.splitlines()), 4)
+
+    def _write_config_dir(self, tmp_dir, files):
+        for name, content in files.items():
+            path = os.path.join(tmp_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+
+    def test_render(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._write_config_dir(
+                tmp_dir,
+                {
+                    "base.yaml": (
+                        "route:\n  receiver: default\n" "receivers:\n- name: default\n"
+                    ),
+                    "team/config.yaml": (
+                        "receivers:\n- name: team\n" "routes:\n- receiver: team\n"
+                    ),
+                },
+            )
+            config_manager = ConfigManager(Namespace(file_path=tmp_dir))
+            self.assertEqual(config_manager.render(), 0)
+            # Rendering must not modify the cached base configuration
+            self.assertEqual(
+                config_manager.read_yaml_file(os.path.join(tmp_dir, "base.yaml")),
+                {"route": {"receiver": "default"}, "receivers": [{"name": "default"}]},
+            )
+            with open(os.path.join(tmp_dir, "alertmanager.yaml")) as f:
+                rendered = yaml.safe_load(f)
+
+        self.assertEqual(
+            [r["name"] for r in rendered["receivers"]], ["default", "team"]
+        )
+        self.assertEqual(rendered["route"]["routes"], [{"receiver": "team"}])
+        self.assertEqual(rendered["time_intervals"], [])
+
+    def test_render_fails_on_undefined_receiver(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._write_config_dir(
+                tmp_dir,
+                {
+                    "base.yaml": "route:\n  receiver: default\n",
+                    "team/config.yaml": "routes:\n- receiver: missing\n",
+                },
+            )
+            config_manager = ConfigManager(Namespace(file_path=tmp_dir))
+            with self.assertLogs(level="ERROR"):
+                self.assertEqual(config_manager.render(), 1)
+            self.assertFalse(os.path.exists(os.path.join(tmp_dir, "alertmanager.yaml")))
+        self.assertEqual(config_manager.fatal_count, 2)
 
     def test_add_receiver_to_master_list(self):
         receiver_data = {"name": "test_receiver"}
@@ -36,12 +241,12 @@ class TestConfigManager(unittest.TestCase):
         )
 
         # Test duplicate receiver
-        self.config_manager._add_receiver_to_master_list(receiver_data, "other.yaml")
-        self.assertEqual(len(self.config_manager.validation_issues), 1)
-        self.assertIn(
-            "Duplicate receiver name 'test_receiver'",
-            self.config_manager.validation_issues[0],
-        )
+        with self.assertLogs(level="ERROR") as logs:
+            self.config_manager._add_receiver_to_master_list(
+                receiver_data, "other.yaml"
+            )
+        self.assertEqual(self.config_manager.fatal_count, 1)
+        self.assertIn("Duplicate receiver name 'test_receiver'", logs.output[0])
 
     def test_validate_single_receiver_config(self):
         # Test valid webhook receiver
@@ -50,20 +255,21 @@ class TestConfigManager(unittest.TestCase):
             "webhook_configs": [{"url": "http://example.com"}],
         }
         self.config_manager._validate_single_receiver_config(receiver_data, "test.yaml")
-        self.assertEqual(len(self.config_manager.validation_issues), 0)
+        self.assertEqual(self.config_manager.fatal_count, 0)
 
         # Test invalid webhook receiver
         invalid_receiver = {
             "name": "invalid_receiver",
             "webhook_configs": [{"url": ""}],  # Empty URL
         }
-        self.config_manager._validate_single_receiver_config(
-            invalid_receiver, "test.yaml"
-        )
-        self.assertEqual(len(self.config_manager.validation_issues), 1)
+        with self.assertLogs(level="ERROR") as logs:
+            self.config_manager._validate_single_receiver_config(
+                invalid_receiver, "test.yaml"
+            )
+        self.assertEqual(self.config_manager.fatal_count, 1)
         self.assertIn(
             "Error: Webhook config 0 for receiver 'invalid_receiver' in file 'test.yaml' is missing a 'url' or it's empty in 'test.yaml'.",
-            self.config_manager.validation_issues[0],
+            logs.output[0],
         )
 
     def test_validate_route_receiver_reference(self):
@@ -82,18 +288,55 @@ class TestConfigManager(unittest.TestCase):
         self.config_manager._validate_route_receiver_reference(
             route_node, "root", "test.yaml"
         )
-        self.assertEqual(len(self.config_manager.validation_issues), 0)
+        self.assertEqual(self.config_manager.fatal_count, 0)
 
         # Test invalid route (missing receiver)
         invalid_route = {"receiver": "nonexistent_receiver"}
-        self.config_manager._validate_route_receiver_reference(
-            invalid_route, "root", "test.yaml"
-        )
-        self.assertEqual(len(self.config_manager.validation_issues), 1)
+        with self.assertLogs(level="ERROR") as logs:
+            self.config_manager._validate_route_receiver_reference(
+                invalid_route, "root", "test.yaml"
+            )
+        self.assertEqual(self.config_manager.fatal_count, 1)
         self.assertIn(
             "Error: Receiver 'nonexistent_receiver' referenced at 'root' in file 'test.yaml' is not defined in any 'receivers' section.",
-            self.config_manager.validation_issues[0],
+            logs.output[0],
+        )
+
+    def test_validate_route_receiver_reference_deep_tree(self):
+        self.config_manager.all_defined_receivers = {
+            "known": {"data": {}, "source_file": "test.yaml"}
+        }
+        route_node = {"receiver": "known"}
+        leaf = route_node
+        for _ in range(5000):
+            leaf["routes"] = [{"receiver": "known"}]
+            leaf = leaf["routes"][0]
+        leaf["routes"] = [{"receiver": "unknown"}, "not-a-route"]
+
+        with self.assertLogs(level="ERROR") as logs:
+            self.config_manager._validate_route_receiver_reference(
+                route_node, "root", "test.yaml"
+            )
+        self.assertEqual(self.config_manager.fatal_count, 2)
+        self.assertIn("Receiver 'unknown'", logs.output[0])
+        self.assertIn("is not a dictionary", logs.output[1])
+
+
+class TestUniqueList(unittest.TestCase):
+    def test_items_keep_insertion_order(self):
+        items = UniqueList([{"name": "b"}, {"name": "a"}])
+        items.add_item({"name": "c"})
+        self.assertEqual(
+            [item["name"] for item in items.get_all_items()], ["b", "a", "c"]
         )
+        self.assertTrue(items.has_key("a"))
+        self.assertEqual(items.get_item_by_key("c"), {"name": "c"})
+        self.assertIsNone(items.get_item_by_key("missing"))
+
+    def test_duplicate_key_raises(self):
+        items = UniqueList([{"name": "a"}])
+        with self.assertRaises(ValueError):
+            items.add_item({"name": "a"})
 
 
 if __name__ == "__main__":
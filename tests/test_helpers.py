@@ -1,10 +1,15 @@
+import hashlib
+
+import yaml
+
+from axe import helpers
 from axe.tree import parse_alertmanager_config
 from unittest.mock import patch, mock_open
 
 
 def test_parse_alertmanager_config():
     """Test parsing of alertmanager configuration."""
-    config_yaml = """
+    config_yaml = b"""
     route:
       receiver: 'default-receiver'
       group_by: ['alertname']
@@ -19,3 +24,51 @@ def test_parse_alertmanager_config():
         assert config["route"]["receiver"] == "default-receiver"
         assert config["route"]["group_by"] == ["alertname"]
         assert config["route"]["routes"][0]["receiver"] == "critical-receiver"
+
+
+def test_parse_alertmanager_config_cache(tmp_path):
+    """Test that parsed configs are pickled and reused while unchanged."""
+    config_path = tmp_path / "alertmanager.yaml"
+    config_path.write_text("route:\n  receiver: default\n")
+
+    config = parse_alertmanager_config(str(config_path), cache=True)
+    assert config == {"route": {"receiver": "default"}}
+    assert (tmp_path / "alertmanager.yaml.pkl").exists()
+
+    # The cached copy is used without parsing the YAML again
+    with patch("axe.helpers._load_yaml") as mock_load:
+        assert parse_alertmanager_config(str(config_path), cache=True) == config
+        mock_load.assert_not_called()
+
+    # Changing the file invalidates the cache
+    config_path.write_text("route:\n  receiver: changed-receiver\n")
+    config = parse_alertmanager_config(str(config_path), cache=True)
+    assert config == {"route": {"receiver": "changed-receiver"}}
+
+
+def test_parse_alertmanager_config_parse_cache_hit():
+    """Test that identical file contents are only parsed once."""
+    config_yaml = b"route:\n  receiver: default\n"
+
+    with patch("builtins.open", mock_open(read_data=config_yaml)):
+        with patch("yaml.load", wraps=yaml.load) as mock_load:
+            first = parse_alertmanager_config("a.yaml")
+            second = parse_alertmanager_config("b.yaml")
+    assert mock_load.call_count == 1
+    assert first is second
+    assert list(helpers._parse_cache) == [
+        hashlib.blake2b(config_yaml, digest_size=16).hexdigest()
+    ]
+
+
+def test_parse_alertmanager_config_parse_cache_evicts_oldest():
+    """Test that the parse cache keeps only the most recently used entries."""
+    with patch.object(helpers, "_PARSE_CACHE_SIZE", 2):
+        for receiver in ("a", "b", "a", "c"):
+            data = f"route:\n  receiver: {receiver}\n".encode()
+            with patch("builtins.open", mock_open(read_data=data)):
+                parse_alertmanager_config("test.yaml")
+    assert [c["route"]["receiver"] for c in helpers._parse_cache.values()] == [
+        "a",
+        "c",
+    ]
@@ -0,0 +1,139 @@
+import re
+import sys
+
+from axe import route_evaluator, tree
+from axe.route import Route, _split_matcher, route_matches
+from axe.route_evaluator import RouteEvaluator
+
+
+def test_route_is_shared_by_evaluator_and_tree():
+    """Test that both commands use the same Route class."""
+    assert route_evaluator.Route is Route
+    assert tree.Route is Route
+
+
+def test_route_fields():
+    """Test that a Route carries the fields both commands need."""
+    data = {
+        "group_wait": "30s",
+        "group_interval": "5m",
+        "repeat_interval": "3h",
+        "routes": [{"receiver": "email", "continue": True}, {"receiver": "slack"}],
+    }
+    route = Route(data)
+
+    assert route.receiver == ""
+    assert (route.group_wait, route.group_interval, route.repeat_interval) == (
+        "30s",
+        "5m",
+        "3h",
+    )
+    # The root continues by default but only explicit flags are displayed
+    assert route.continue_flag and not route.continue_set
+    assert [(r.continue_flag, r.continue_set) for r in route.routes] == [
+        (True, True),
+        (False, False),
+    ]
+
+
+def test_route_without_receiver_evaluates_to_default():
+    """Test that the evaluator reports routes without a receiver as default."""
+    evaluator = RouteEvaluator({"routes": [{"match": {"severity": "critical"}}]})
+    assert evaluator.evaluate_alert({"severity": "warning"}) == ["default"]
+    assert evaluator.evaluate_alert({"severity": "critical"}) == ["default"]
+
+
+def test_route_interns_label_names_and_values():
+    """Test that label names, exact values and receivers are interned."""
+    label = "".join(["sever", "ity"])
+    route = Route(
+        {
+            "receiver": "".join(["em", "ail"]),
+            "match": {label: "".join(["crit", "ical"])},
+            "matchers": ["".join(["te", 'am="infra"'])],
+        }
+    )
+    assert route.receiver is sys.intern("email")
+    ((key, value),) = route._match_items
+    assert key is sys.intern("severity") and value is sys.intern("critical")
+    assert route._parsed_matchers[0][0] is sys.intern("team")
+    assert route._parsed_matchers[0][2] is sys.intern("infra")
+
+
+def test_route_matches_function():
+    """Test the module-level matching loop used by Route.matches_alert."""
+    pattern = re.compile("web")
+    search = lambda p, value: p.search(value) is not None  # noqa: E731
+    reported = []
+
+    def report(*args):
+        reported.append(args)
+
+    matchers = [("env", "!=", "dev"), ("job", "=~", pattern)]
+    labels = {"severity": "critical", "env": "prod", "job": "web-1"}
+    assert route_matches(
+        (("severity", "critical"),), (), matchers, labels, search, report
+    )
+    assert reported == [("env", "!=", "dev", "prod"), ("job", "=~", pattern, "web-1")]
+
+    assert not route_matches((("severity", "warning"),), (), [], labels, search)
+    assert not route_matches((), (("job", None),), [], labels, search)
+    assert not route_matches((), (), [None], labels, search)
+
+
+def test_split_matcher():
+    """Test splitting matcher strings into label, operator and value."""
+    assert _split_matcher('  severity = "critical" ') == (
+        "severity",
+        "=",
+        '"critical"',
+    )
+    assert _split_matcher("job=~^web-.*$") == ("job", "=~", "^web-.*$")
+    assert _split_matcher("env!=") == ("env", "!=", "")
+    assert _split_matcher("url=a=b") == ("url", "=", "a=b")
+    # Unknown operators are left for the caller to reject
+    assert _split_matcher("env==prod") == ("env", "==", "prod")
+    assert _split_matcher("=prod") is None
+    assert _split_matcher("1env=prod") is None
+    assert _split_matcher("my env=prod") is None
+    assert _split_matcher("env") is None
+
+
+def test_route_has_slots(default_config_dict):
+    """Test that routes store their attributes in slots."""
+    route = Route(default_config_dict)
+    assert not hasattr(route, "__dict__")
+    assert not hasattr(route.routes[0], "__dict__")
+
+
+def test_route_builds_sub_routes_lazily(default_config_dict):
+    """Test that sub-routes are only built when first accessed."""
+    route = Route(default_config_dict)
+    assert route._routes is None
+    assert route._has_children
+
+    routes = route.routes
+    assert [r.receiver for r in routes] == ["critical-receiver"]
+    assert routes[0].parent is route
+    assert routes[0]._routes is None
+    assert route.routes is routes
+
+
+def test_route_interns_repeated_tree_fields():
+    """Test that strings repeated across sibling routes share one object."""
+    data = {
+        "routes": [
+            {
+                "receiver": "".join(["team-", "a"]),
+                "group_by": ["".join(["alert", "name"])],
+                "match_re": {"".join(["inst", "ance"]): ".*"},
+                "group_wait": "".join(["30", "s"]),
+            }
+            for _ in range(2)
+        ]
+    }
+    first, second = Route(data).routes
+    assert first.receiver is second.receiver
+    assert first.group_by[0] is second.group_by[0]
+    assert next(iter(first.match_re)) is next(iter(second.match_re))
+    assert first.group_wait is second.group_wait
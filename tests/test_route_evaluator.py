@@ -1,3 +1,4 @@
+from unittest.mock import patch
 from axe.route_evaluator import Route, RouteEvaluator
 
 
@@ -50,6 +51,17 @@ def test_route_matches_alert_matchers():
     assert not route.matches_alert(alert)
 
 
+def test_route_invalid_regex_never_matches():
+    """Test that invalid regexes are rejected when the route is built."""
+    route = Route({"receiver": "email", "match_re": {"job": "(web"}})
+    assert route._match_re_compiled == {"job": None}
+    assert not route.matches_alert({"job": "(web"})
+
+    route = Route({"receiver": "email", "matchers": ["job=~(web", "env==prod"]})
+    assert route._parsed_matchers == [None, None]
+    assert not route.matches_alert({"job": "web", "env": "prod"})
+
+
 def test_route_evaluator_simple_route():
     """Test route evaluation with simple route structure."""
     config = {
@@ -155,3 +167,224 @@ def test_route_evaluator_complex_route():
     assert (
         len(receivers) == 2
     )  # Only default and email should match since pagerduty doesn't match
+
+
+def test_route_evaluator_stops_at_first_non_continue_child():
+    """Test that a matching child without continue stops its later siblings."""
+    config = {
+        "receiver": "default",
+        "routes": [
+            {"receiver": "team", "match": {"team": "infra"}},
+            {"receiver": "critical", "match": {"severity": "critical"}},
+        ],
+    }
+    evaluator = RouteEvaluator(config)
+
+    alert = {"team": "infra", "severity": "critical"}
+    assert evaluator.evaluate_alert(alert) == ["team"]
+
+    alert = {"team": "web", "severity": "critical"}
+    assert evaluator.evaluate_alert(alert) == ["critical"]
+
+    alert = {"team": "web", "severity": "warning"}
+    assert evaluator.evaluate_alert(alert) == ["default"]
+
+
+def test_route_evaluator_flattens_routes_in_configuration_order():
+    """Test that the route tree is compiled into parent/child/sibling arrays."""
+    config = {
+        "receiver": "default",
+        "routes": [
+            {"receiver": "a", "routes": [{"receiver": "a1"}, {"receiver": "a2"}]},
+            {"receiver": "b"},
+        ],
+    }
+    evaluator = RouteEvaluator(config)
+
+    assert evaluator._receivers == ["default", "a", "a1", "a2", "b"]
+    assert list(evaluator._parent) == [-1, 0, 1, 1, 0]
+    assert list(evaluator._first_child) == [1, 2, -1, -1, -1]
+    assert list(evaluator._next_sibling) == [-1, 4, 3, -1, -1]
+
+
+def test_route_evaluator_exact_index_rules_out_routes():
+    """Test that routes with unsatisfied exact matches skip their matchers."""
+    config = {
+        "receiver": "default",
+        "routes": [
+            {"receiver": "infra", "match": {"team": "infra", "env": ""}},
+            {"receiver": "any", "match": {"labels": ["unhashable"]}},
+        ],
+    }
+    evaluator = RouteEvaluator(config)
+    assert list(evaluator._exact_counts) == [0, 2, 0]
+
+    unmatched = evaluator._unmatched_exact_counts({"team": "infra"})
+    assert list(unmatched) == [0, 0, 0]
+    unmatched = evaluator._unmatched_exact_counts({"team": "infra", "env": "prod"})
+    assert list(unmatched) == [0, 1, 0]
+
+    assert evaluator.evaluate_alert({"team": "infra"}) == ["infra"]
+    assert evaluator.evaluate_alert({"team": "infra", "env": "prod"}) == ["default"]
+
+    # Unhashable alert values leave the routes matching on them unmatched
+    unmatched = evaluator._unmatched_exact_counts({"team": ["infra"]})
+    assert list(unmatched) == [0, 1, 0]
+    assert evaluator.evaluate_alert({"team": ["infra"]}) == ["default"]
+    assert evaluator.evaluate_alert({"labels": ["unhashable"]}) == ["any"]
+
+
+def test_route_evaluator_caches_regex_results():
+    """Test that regex results are cached per pattern and label value."""
+    config = {
+        "receiver": "default",
+        "routes": [{"receiver": "web", "matchers": ["job=~.*web.*"]}],
+    }
+    evaluator = RouteEvaluator(config)
+    pattern = evaluator.root_route.routes[0]._parsed_matchers[0][2]
+
+    assert evaluator.evaluate_alert({"job": "web-server"}) == ["web"]
+    assert evaluator._regex_cache == {(id(pattern), "web-server"): True}
+
+    evaluator._regex_cache[(id(pattern), "web-server")] = False
+    evaluator._result_cache.clear()
+    assert evaluator.evaluate_alert({"job": "web-server"}) == ["default"]
+
+
+def test_route_checks_exact_matchers_before_regex_matchers():
+    """Test that parsed matchers are ordered cheapest first."""
+    route = Route(
+        {
+            "receiver": "email",
+            "matchers": ["job=~.*web.*", 'severity="critical"', "env!=dev"],
+        }
+    )
+    assert [m[:2] for m in route._parsed_matchers] == [
+        ("severity", "="),
+        ("env", "!="),
+        ("job", "=~"),
+    ]
+    assert route.matches_alert({"severity": "critical", "job": "web"})
+    assert not route.matches_alert({"severity": "warning", "job": "web"})
+
+
+def test_route_evaluator_returns_sorted_unique_receivers():
+    """Test that matched receivers come back sorted and deduplicated."""
+    config = {
+        "receiver": "default",
+        "routes": [
+            {"receiver": "zeta", "continue": True},
+            {"receiver": "alpha", "continue": True},
+            {"receiver": "zeta", "continue": True},
+        ],
+    }
+    evaluator = RouteEvaluator(config)
+    assert evaluator._receiver_names == ["alpha", "default", "zeta"]
+    assert evaluator._receiver_bits == [2, 4, 1, 4]
+    assert evaluator.evaluate_alert({}) == ["alpha", "default", "zeta"]
+
+
+def test_route_evaluator_memoizes_on_relevant_labels():
+    """Test that results are reused for alerts agreeing on referenced labels."""
+    config = {
+        "receiver": "default",
+        "routes": [
+            {"receiver": "critical", "match": {"severity": "critical"}},
+            {"receiver": "web", "matchers": ["job=~web.*"]},
+        ],
+    }
+    evaluator = RouteEvaluator(config)
+    assert evaluator._relevant_labels == ("job", "severity")
+
+    receivers = evaluator.evaluate_alert({"severity": "critical", "host": "a"})
+    assert receivers == ["critical"]
+    assert evaluator._result_cache == {("", "critical"): ["critical"]}
+
+    # Callers get their own copy of the memoized list
+    receivers.append("mutated")
+    assert evaluator.evaluate_alert({"severity": "critical", "host": "b"}) == [
+        "critical"
+    ]
+    assert len(evaluator._result_cache) == 1
+
+
+def test_route_fuses_regex_matchers_on_the_same_label():
+    """Test that several =~ matchers on one label become a single pattern."""
+    route = Route(
+        {"receiver": "web", "matchers": ["job=~web", "job=~^.*ser", "env=~p"]}
+    )
+    assert [m[:2] for m in route._parsed_matchers] == [("env", "=~"), ("job", "=~")]
+
+    assert route.matches_alert({"job": "web-server", "env": "prod"})
+    assert route.matches_alert({"job": "server-web", "env": "prod"})
+    assert not route.matches_alert({"job": "web-api", "env": "prod"})
+    assert not route.matches_alert({"job": "web-server", "env": "dev"})
+
+    # Inline flags stay scoped to their own pattern
+    route = Route({"matchers": ["job=~web", "job=~(?i)SER"]})
+    assert len(route._parsed_matchers) == 2
+    assert route.matches_alert({"job": "web-SER"})
+    assert not route.matches_alert({"job": "WEB-ser"})
+
+    # Verbose routes keep each matcher separate for reporting
+    route = Route({"matchers": ["job=~web", "job=~ser"]}, verbose=True)
+    assert len(route._parsed_matchers) == 2
+
+
+def test_route_with_conflicting_equalities_never_matches():
+    """Test that routes requiring two values for one label are always false."""
+    route = Route({"match": {"env": "prod"}, "matchers": ['env="dev"']})
+    assert route._never_matches
+    assert not route.matches_alert({"env": "prod"})
+    assert not route.matches_alert({"env": "dev"})
+
+    route = Route({"match": {"env": "prod"}, "matchers": ['env="prod"']})
+    assert not route._never_matches
+    assert route.matches_alert({"env": "prod"})
+
+
+def test_route_match_empty_value_matches_missing_label():
+    """Test that an empty `match` value matches alerts without the label."""
+    route = Route({"receiver": "email", "match": {"team": ""}})
+    assert route._match_items == (("team", ""),)
+    assert route.matches_alert({"severity": "critical"})
+    assert route.matches_alert({"team": ""})
+    assert not route.matches_alert({"team": "infra"})
+
+
+def test_route_evaluator_evaluate_alerts():
+    """Test batch evaluation of several alerts."""
+    config = {
+        "receiver": "default",
+        "routes": [{"receiver": "email", "match": {"severity": "critical"}}],
+    }
+    evaluator = RouteEvaluator(config)
+
+    alerts = [
+        {"severity": "critical", "alertname": "DiskFull"},
+        {"severity": "warning"},
+        {"severity": "critical", "alertname": "HighCPU"},
+    ]
+    assert evaluator.evaluate_alerts(alerts) == [["email"], ["default"], ["email"]]
+    # Alerts sharing the referenced labels reuse one cached result
+    assert len(evaluator._result_cache) == 2
+
+
+def test_route_evaluator_buffers_verbose_output(capsys):
+    """Test that verbose diagnostics are written once the evaluation ends."""
+    config = {
+        "receiver": "default",
+        "routes": [{"receiver": "email", "matchers": ['severity="critical"']}],
+    }
+    evaluator = RouteEvaluator(config, verbose=True)
+
+    with patch.object(evaluator, "_flush_log", wraps=evaluator._flush_log) as flush:
+        assert evaluator.evaluate_alert({"severity": "critical"}) == ["email"]
+    flush.assert_called_once()
+    assert evaluator._log_buffer == []
+
+    output = capsys.readouterr().out
+    assert 'Matcher matched: severity = "critical"' in output
+    assert output.index("Route email MATCHED alert.") < output.index(
+        "Adding receiver: email"
+    )
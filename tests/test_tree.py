@@ -1,47 +1,53 @@
+import importlib.util
 import os
 import sys
+import time
+
+import pytest
+import yaml
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from axe.tree import Route, tree
 from rich.tree import Tree
 from unittest.mock import patch, mock_open, MagicMock
 
+# Keep this module's tests on one xdist worker (with --dist loadgroup) so
+# they share that worker's Rich and YAML imports while other modules run
+# in parallel.
+pytestmark = pytest.mark.xdist_group("tree_tests")
 
-def test_route_creation():
-    """Test Route object creation with basic configuration."""
-    config = {
-        "receiver": "default-receiver",
-        "group_by": ["alertname"],
-        "routes": [
-            {"receiver": "critical-receiver", "match": {"severity": "critical"}}
-        ],
-    }
+# Seconds the 10k-route test may take. pytest-timeout enforces the limit when
+# installed; otherwise the test checks its own duration once it finishes.
+_LARGE_TREE_TIMEOUT = 2
+_HAS_PYTEST_TIMEOUT = importlib.util.find_spec("pytest_timeout") is not None
 
-    route = Route(config)
+# Route configurations used by individual tests, built once at import. Route
+# only reads its data, so tests can share them.
+_FIXTURES = {
+    "matchers": {
+        "receiver": "default",
+        "matchers": ["instance =~ ^.*$", "job =~ ^.*$"],
+    },
+    "plain": {
+        "receiver": "default",
+        "group_by": ["alertname", "cluster"],
+        "routes": [{"receiver": "email", "match": {"severity": "critical"}}],
+    },
+}
+
+
+def test_route_creation(default_config_dict):
+    """Test Route object creation with basic configuration."""
+    route = Route(default_config_dict)
     assert route.receiver == "default-receiver"
     assert route.group_by == ["alertname"]
     assert len(route.routes) == 1
     assert route.routes[0].receiver == "critical-receiver"
 
 
-def test_route_to_tree():
+def test_route_to_tree(default_config_dict):
     """Test conversion of Route to rich.Tree."""
-    config = {
-        "receiver": "default-receiver",
-        "group_by": ["alertname"],
-        "match": {"severity": "warning"},
-        "match_re": {"instance": ".*"},
-        "matchers": [{"name": "region", "value": "us-east-1", "isRegex": False}],
-        "continue": True,
-        "group_wait": "30s",
-        "group_interval": "5m",
-        "repeat_interval": "3h",
-        "routes": [
-            {"receiver": "critical-receiver", "match": {"severity": "critical"}}
-        ],
-    }
-
-    route = Route(config)
+    route = Route(default_config_dict)
     tree = Tree("Test")
     route.to_tree(tree)
 
@@ -53,7 +59,7 @@ def test_route_to_tree():
 
 def test_tree_command_success():
     """Test tree command with valid configuration."""
-    config_yaml = """
+    config_yaml = b"""
     route:
       receiver: 'default-receiver'
       group_by: ['alertname']
@@ -64,6 +70,8 @@ def test_tree_command_success():
     """
 
     mock_args = MagicMock()
+    mock_args.cache = False
+    mock_args.plain = False
     mock_args.file_path = "test.yaml"
 
     with patch("builtins.open", mock_open(read_data=config_yaml)):
@@ -72,14 +80,65 @@ def test_tree_command_success():
             assert exit_code == 0
             mock_print.assert_called_once()
 
+        # The same contents are served from the parse cache
+        with patch("yaml.load") as mock_load:
+            with patch("axe.tree.print") as mock_print:
+                assert tree(mock_args) == 0
+            mock_load.assert_not_called()
+            mock_print.assert_called_once()
+
+
+@pytest.mark.skipif(
+    not hasattr(yaml, "CSafeLoader"), reason="PyYAML built without libyaml"
+)
+def test_tree_command_uses_c_loader():
+    """Test that the tree command parses YAML with the libyaml-backed loader."""
+    mock_args = MagicMock()
+    mock_args.cache = False
+    mock_args.plain = False
+    mock_args.file_path = "test.yaml"
+
+    with patch("builtins.open", mock_open(read_data=b"route:\n  receiver: default\n")):
+        with patch("yaml.load", wraps=yaml.load) as mock_load:
+            with patch("axe.tree.print"):
+                assert tree(mock_args) == 0
+    mock_load.assert_called_once()
+    assert mock_load.call_args.kwargs["Loader"] is yaml.CSafeLoader
+
+
+def test_tree_command_null_keys():
+    """Test tree command with route keys left empty in YAML."""
+    config_yaml = b"""
+    route:
+      receiver: default
+      group_by:
+      routes:
+      - receiver: web
+        match:
+        match_re:
+        matchers:
+        routes:
+    """
+
+    mock_args = MagicMock()
+    mock_args.cache = False
+    mock_args.plain = False
+    mock_args.file_path = "test.yaml"
+
+    with patch("builtins.open", mock_open(read_data=config_yaml)):
+        with patch("axe.tree.print") as mock_print:
+            assert tree(mock_args) == 0
+            mock_print.assert_called_once()
+
 
 def test_tree_command_file_not_found():
     """Test tree command with non-existent file."""
     mock_args = MagicMock()
+    mock_args.cache = False
+    mock_args.plain = False
     mock_args.file_path = "nonexistent.yaml"
 
-    with patch("builtins.open", mock_open()) as mock_file:
-        mock_file.side_effect = FileNotFoundError
+    with patch("builtins.open", side_effect=FileNotFoundError):
         with patch("axe.tree.print") as mock_print:
             exit_code = tree(mock_args)
             assert exit_code == 1
@@ -91,9 +150,11 @@ def test_tree_command_file_not_found():
 def test_tree_command_yaml_error():
     """Test tree command with invalid YAML."""
     mock_args = MagicMock()
+    mock_args.cache = False
+    mock_args.plain = False
     mock_args.file_path = "invalid.yaml"
 
-    with patch("builtins.open", mock_open(read_data="invalid:yaml")):
+    with patch("builtins.open", mock_open(read_data=b"invalid:yaml")):
         with patch("axe.tree.print") as mock_print:
             exit_code = tree(mock_args)
             assert exit_code == 1
@@ -102,53 +163,47 @@ def test_tree_command_yaml_error():
             )
 
 
-def test_route_tree_structure():
+def test_route_tree_structure(default_config_dict):
     """Test the core logic of route tree visualization."""
-    # Create a route with various configurations
-    data = {
-        "receiver": "default",
-        "group_by": ["alertname"],
-        "match": {"severity": "critical"},
-        "match_re": {"job": ".*"},
-        "continue": True,
-        "routes": [{"receiver": "email"}],
-    }
-
-    route = Route(data)
+    route = Route(default_config_dict)
     tree = Tree("Root")
     route.to_tree(tree)
 
     # Verify the tree structure
     assert len(tree.children) == 1  # One root route
     root_node = tree.children[0]
-    assert "default" in str(root_node.label)  # Receiver is displayed correctly
+    assert "default-receiver" in str(root_node.label)  # Receiver is displayed correctly
 
     # Verify child nodes exist for different configurations
-    assert any("Group By" in str(child.label) for child in root_node.children)
-    assert any("Match" in str(child.label) for child in root_node.children)
-    assert any("Match RE" in str(child.label) for child in root_node.children)
-    assert any("Continue" in str(child.label) for child in root_node.children)
-    assert any(
-        "email" in str(child.label) for child in root_node.children
-    )  # Nested route
+    labels = [str(child.label) for child in root_node.children]
+    assert any("Group By" in label for label in labels)
+    assert any("Match" in label for label in labels)
+    assert any("Match RE" in label for label in labels)
+    assert any("Continue" in label for label in labels)
+    assert any("critical-receiver" in label for label in labels)  # Nested route
+
+    # Index the nodes inspected below by keyword
+    by_key = {
+        keyword: child
+        for child, label in zip(root_node.children, labels)
+        for keyword in ("Continue", "critical-receiver")
+        if keyword in label
+    }
 
     # Verify the continue flag is properly displayed
-    continue_node = next(
-        (c for c in root_node.children if "Continue" in str(c.label)), None
-    )
+    continue_node = by_key.get("Continue")
     assert continue_node is not None
     assert "true" in str(continue_node.label)
 
     # Verify nested route structure
-    email_node = next((c for c in root_node.children if "email" in str(c.label)), None)
-    assert email_node is not None
-    assert len(email_node.children) == 0  # No further nesting in this example
+    child_node = by_key.get("critical-receiver")
+    assert child_node is not None
+    assert len(child_node.children) == 1  # Only its match criteria, no nesting
 
 
 def test_route_tree_structure_with_matchers():
     """Test route tree structure with matchers."""
-    data = {"receiver": "default", "matchers": ["instance =~ ^.*$", "job =~ ^.*$"]}
-    route = Route(data)
+    route = Route(_FIXTURES["matchers"])
     tree = Tree("Root")
     route.to_tree(tree)
 
@@ -161,3 +216,87 @@ def test_route_tree_structure_with_matchers():
     assert len(matchers_node.children) == 2  # Two matchers
     assert any("instance =~ ^.*$" in str(c.label) for c in matchers_node.children)
     assert any("job =~ ^.*$" in str(c.label) for c in matchers_node.children)
+
+
+def test_route_to_plain():
+    """Test plain-text rendering of the route tree."""
+    assert list(Route(_FIXTURES["plain"]).to_plain()) == [
+        "default",
+        "  Group By: alertname, cluster",
+        "  email",
+        "    Match",
+        "      severity = critical",
+    ]
+
+
+def test_tree_command_plain(capsys):
+    """Test tree command writing plain output to stdout."""
+    mock_args = MagicMock()
+    mock_args.cache = False
+    mock_args.plain = True
+
+    with patch("builtins.open", mock_open(read_data=b"route:\n  receiver: default\n")):
+        assert tree(mock_args) == 0
+    assert capsys.readouterr().out == "Alertmanager Route Tree\ndefault\n"
+
+
+def test_to_tree_deep():
+    """Test building and rendering a route chain deeper than the recursion limit."""
+    depth = 2000
+    data = {"receiver": "leaf"}
+    for level in range(depth - 1, 0, -1):
+        data = {"receiver": f"level-{level}", "routes": [data]}
+
+    route = Route(data)
+    tree = Tree("Root")
+    route.to_tree(tree)
+
+    node = tree.children[0]
+    for level in range(1, depth):
+        assert str(node.label) == f"level-{level}"
+        node = node.children[-1]
+    assert str(node.label) == "leaf"
+    assert len(list(route.to_plain())) == depth
+
+
+def test_tree_command_deep():
+    """Test tree command with a route chain deeper than the recursion limit."""
+    depth = 1000
+    config_yaml = (
+        "route: "
+        + "".join(f"{{receiver: level-{level}, routes: [" for level in range(1, depth))
+        + "{receiver: leaf}"
+        + "]}" * (depth - 1)
+    ).encode()
+
+    mock_args = MagicMock()
+    mock_args.cache = False
+    mock_args.plain = False
+    mock_args.file_path = "test.yaml"
+
+    with patch("builtins.open", mock_open(read_data=config_yaml)):
+        with patch("axe.tree.print") as mock_print:
+            assert tree(mock_args) == 0
+    mock_print.assert_called_once()
+
+    node = mock_print.call_args.args[0].children[0]
+    for level in range(1, depth):
+        assert str(node.label) == f"level-{level}"
+        node = node.children[-1]
+    assert str(node.label) == "leaf"
+
+
+@pytest.mark.timeout(_LARGE_TREE_TIMEOUT)
+def test_route_tree_structure_large():
+    """Test that building and rendering 10k sibling routes stays linear."""
+    start = time.perf_counter()
+    big = {"receiver": "r", "routes": [{"receiver": f"r{i}"} for i in range(10000)]}
+
+    route = Route(big)
+    tree = Tree("Root")
+    route.to_tree(tree)
+
+    assert len(tree.children[0].children) >= 10000
+    assert str(tree.children[0].children[-1].label) == "r9999"
+    if not _HAS_PYTEST_TIMEOUT:
+        assert time.perf_counter() - start < _LARGE_TREE_TIMEOUT